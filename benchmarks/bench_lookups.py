@@ -0,0 +1,152 @@
+"""Micro-benchmark for the precompiled material/decade lookup tables.
+
+Compares the per-call cost of the original ``material()`` and
+``install_date_range()`` bodies, which rebuilt their tables on every call,
+against the module-level tables in ``leadcast.lookups``.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_lookups [--calls 1000000]
+"""
+
+import argparse
+import datetime
+import timeit
+
+from leadcast.lookups import MATERIAL_MAP_2025, decade_label
+
+MATERIAL_CODES = ["LD", "CU", "UNK", "UNK-NL", "GALV", "PL", "XX"]
+INSTALL_DATES = ["6/15/1899", "3/2/1925", "11/30/1958", "7/4/1991", "1/1/2021"]
+
+
+def legacy_material(material):
+    """material() as it was in translate_lancaster4_2025.py."""
+    new_materials = [
+        "A) LEAD",  # 0
+        "B) LEAD-LINED GALVANIZED",  # 1
+        "C) GALVANIZED",  # 2
+        "D) COPPER",  # 3
+        "E) CAST IRON - LINED",  # 4
+        "F) CAST IRON - UNLINED",  # 5
+        "G) HDPE - HIGH DENSITY POLYETHYLENE",  # 6
+        "H) PVC - POLYVINYL CHLORIDE",  # 7
+        "I) BRASS",  # 8
+        "J) CPVC - CHLORINE TREATED PVC",  # 9
+        "K) PEX - CROSS-LINKED POLYETHYLENE",  # 10
+        "L) ABS - ACRYLONITRILE BUTADIENE STYRENE",  # 11
+        "M) PB - POLYBUTYLENE",  # 12
+        "N) DUCTILE IRON",  # 13
+        "O) ASBESTOS CEMENT",  # 14
+        "P) OTHER NON-LEAD MATERIAL",  # 15
+        "S) UNKNOWN",  # 16
+        "T) UNKNOWN - NOT LEAD",  # 17
+    ]
+    new_material_map = {
+        "LD": new_materials[0],
+        "CU": new_materials[3],
+        "BR": new_materials[8],
+        "DI": new_materials[13],
+        "PVC": new_materials[7],
+        "CI": new_materials[5],
+        "GALV": new_materials[2],
+        "UNK-NL": new_materials[17],
+        "UNK": new_materials[16],
+        "HDPE": new_materials[6],
+        "PE": new_materials[17],
+        "PL": new_materials[17],
+        "AC": new_materials[17],
+    }
+    return new_material_map.get(material, None)
+
+
+def legacy_decade(utility_install_date):
+    """Date range mapping from the original install_date_range(), minus parsing."""
+    date_ranges = [
+        "A) Pre-1901",
+        "B) 1901 - 1910",
+        "C) 1911 - 1920",
+        "D) 1921 - 1930",
+        "E) 1931 - 1940",
+        "F) 1941 - 1950",
+        "G) 1951 - 1960",
+        "H) 1961 - 1970",
+        "J) 1971 - 1980",
+        "K) 1981 - 1990",
+        "L) 1991 - 2000",
+        "M) 2001 - 2010",
+        "O) 2011 - 2020",
+        "P) 2021 - 2030",
+    ]
+    date_mapping = [
+        (datetime.date(1901, 1, 1), datetime.date(1910, 12, 31), date_ranges[1]),
+        (datetime.date(1911, 1, 1), datetime.date(1920, 12, 31), date_ranges[2]),
+        (datetime.date(1921, 1, 1), datetime.date(1930, 12, 31), date_ranges[3]),
+        (datetime.date(1931, 1, 1), datetime.date(1940, 12, 31), date_ranges[4]),
+        (datetime.date(1941, 1, 1), datetime.date(1950, 12, 31), date_ranges[5]),
+        (datetime.date(1951, 1, 1), datetime.date(1960, 12, 31), date_ranges[6]),
+        (datetime.date(1961, 1, 1), datetime.date(1970, 12, 31), date_ranges[7]),
+        (datetime.date(1971, 1, 1), datetime.date(1980, 12, 31), date_ranges[8]),
+        (datetime.date(1981, 1, 1), datetime.date(1990, 12, 31), date_ranges[9]),
+        (datetime.date(1991, 1, 1), datetime.date(2000, 12, 31), date_ranges[10]),
+        (datetime.date(2001, 1, 1), datetime.date(2010, 12, 31), date_ranges[11]),
+        (datetime.date(2011, 1, 1), datetime.date(2020, 12, 31), date_ranges[12]),
+        (datetime.date(2021, 1, 1), datetime.date(2030, 12, 31), date_ranges[13]),
+    ]
+    if utility_install_date < datetime.date(1901, 1, 1):
+        return date_ranges[0]
+    for start_date, end_date, label in date_mapping:
+        if start_date <= utility_install_date <= end_date:
+            return label
+    return None
+
+
+def legacy_install_date_range(date):
+    utility_install_date = datetime.datetime.strptime(date, "%m/%d/%Y").date()
+    return legacy_decade(utility_install_date)
+
+
+def compiled_install_date_range(date):
+    utility_install_date = datetime.datetime.strptime(date, "%m/%d/%Y").date()
+    return decade_label(utility_install_date.year)
+
+
+def per_million(func, values, calls):
+    """Seconds spent per one million calls of func over a cycle of values."""
+    n = len(values)
+    loops = max(calls // n, 1)
+
+    def run():
+        for value in values:
+            func(value)
+
+    seconds = min(timeit.repeat(run, number=loops, repeat=3))
+    return seconds / (loops * n) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    dates = [datetime.datetime.strptime(d, "%m/%d/%Y").date() for d in INSTALL_DATES]
+    cases = [
+        ("material()", legacy_material, MATERIAL_MAP_2025.get, MATERIAL_CODES),
+        ("decade mapping", legacy_decade, lambda d: decade_label(d.year), dates),
+        (
+            "install_date_range()",
+            legacy_install_date_range,
+            compiled_install_date_range,
+            INSTALL_DATES,
+        ),
+    ]
+
+    print(f"{'helper':<24}{'before s/1M':>14}{'after s/1M':>14}{'speedup':>10}")
+    for name, before, after, values in cases:
+        for value in values:
+            assert before(value) == after(value), (name, value)
+        t_before = per_million(before, values, args.calls)
+        t_after = per_million(after, values, args.calls)
+        print(f"{name:<24}{t_before:>14.3f}{t_after:>14.3f}{t_before / t_after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""End-to-end throughput of every translate_* module on synthetic exports.
+
+For each export size, module and operation (translate, translate_to_csv,
+translate_to_xlsm) the run happens in a fresh interpreter, so that peak RSS
+is that run's alone. The import operation measures startup instead: the
+cumulative `python -X importtime` of each module and of the command line
+entry point, and whether openpyxl got imported along the way. Exports and the stand-in DEP form come from
+benchmarks.synthetic_export and are kept in the work directory between runs.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_translate [--sizes 10k,100k] [--modules translate_lancaster4_2025]
+        [--ops import,translate,csv,xlsm] [--workers N] [--template FORM.xlsm] [--json results.json]
+"""
+
+import argparse
+import contextlib
+import csv
+import glob
+import importlib
+import inspect
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_export import parse_size, write_export, write_template
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPERATIONS = ("import", "translate", "csv", "xlsm")
+# Imported by `python -m leadcast` before it reads its arguments
+ENTRY_POINTS = ("leadcast.cli", "leadcast.convert")
+# Rows a worksheet holds below the form's header rows
+SHEET_ROWS = 1_048_576 - 10
+
+
+def modules():
+    """Every translate_* module at the repository root"""
+    return sorted(
+        os.path.splitext(os.path.basename(path))[0]
+        for path in glob.glob(os.path.join(ROOT, "translate*.py"))
+    )
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes, 0 where unknown"""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _call(func, *args, workers=None):
+    if workers and "workers" in inspect.signature(func).parameters:
+        return func(*args, workers=workers)
+    return func(*args)
+
+
+def run_one(module_name, operation, input_csv, template, output, workers=None) -> dict:
+    """Run one operation in this process and measure it"""
+    module = importlib.import_module(module_name)
+    start = time.perf_counter()
+    # The translators report progress on stdout, which is ours
+    with contextlib.redirect_stdout(sys.stderr):
+        if operation == "translate":
+            with open(input_csv, mode="r", encoding="utf-8") as infile:
+                _call(module.translate, csv.DictReader(infile), workers=workers)
+        elif operation == "csv":
+            _call(module.translate_to_csv, input_csv, output, workers=workers)
+        else:
+            _call(
+                module.translate_to_xlsm, input_csv, template, output, workers=workers
+            )
+    return {"seconds": time.perf_counter() - start, "peak_rss": peak_rss()}
+
+
+def import_time(module_name):
+    """(seconds, imported modules) of importing module_name in a fresh interpreter
+
+    Best of three, from the cumulative column of -X importtime.
+    """
+    best = None
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+            cwd=ROOT,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+        imported = set()
+        cumulative = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, microseconds, name = line.split("|")
+            if not microseconds.strip().isdigit():
+                # The header line
+                continue
+            imported.add(name.strip())
+            if name.strip() == module_name:
+                cumulative = int(microseconds)
+        if best is None or cumulative < best[0]:
+            best = (cumulative, imported)
+    return best[0] / 1e6, best[1]
+
+
+def run_isolated(module_name, operation, input_csv, template, output, workers=None):
+    """Run one operation in a fresh interpreter, None if it failed"""
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_translate",
+        "--run",
+        module_name,
+        operation,
+        input_csv,
+        template,
+        output,
+    ]
+    if workers:
+        command += ["--workers", str(workers)]
+    result = subprocess.run(
+        command, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    if result.returncode:
+        last = result.stderr.strip().splitlines()[-1:] or ["failed"]
+        print(f"  {module_name} {operation}: {last[0]}", file=sys.stderr)
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10k,100k", help="e.g. 10k,100k,1M,5M")
+    parser.add_argument("--modules", default=",".join(modules()))
+    parser.add_argument("--ops", default=",".join(OPERATIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--template", default=None, help="DEP form, else a generated stand-in"
+    )
+    parser.add_argument(
+        "--workdir", default=os.path.join(tempfile.gettempdir(), "leadcast-bench")
+    )
+    parser.add_argument("--json", default=None, help="Also write the results here")
+    parser.add_argument("--run", nargs=5, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        # Child side of run_isolated()
+        print(json.dumps(run_one(*args.run, workers=args.workers)))
+        return
+
+    os.makedirs(args.workdir, exist_ok=True)
+    template = args.template or os.path.join(args.workdir, "template.xlsm")
+    if not os.path.exists(template):
+        write_template(template)
+    output = os.path.join(args.workdir, "output")
+
+    results = []
+    operations = args.ops.split(",")
+    if "import" in operations:
+        operations.remove("import")
+        print(f"{'module':<30}{'import ms':>10}  openpyxl")
+        for module_name in args.modules.split(",") + list(ENTRY_POINTS):
+            seconds, imported = import_time(module_name)
+            openpyxl = "openpyxl" in imported
+            results.append(
+                dict(
+                    module=module_name,
+                    operation="import",
+                    seconds=seconds,
+                    openpyxl=openpyxl,
+                )
+            )
+            print(
+                f"{module_name:<30}{seconds * 1000:>10.1f}  {'yes' if openpyxl else 'no'}"
+            )
+        print()
+
+    if operations:
+        print(
+            f"{'module':<30}{'op':<11}{'rows':>10}{'seconds':>10}"
+            f"{'rows/s':>11}{'peak MB':>10}"
+        )
+    for size in args.sizes.split(",") if operations else ():
+        rows = parse_size(size)
+        input_csv = os.path.join(args.workdir, f"export-{rows}-{args.seed}.csv")
+        if not os.path.exists(input_csv):
+            write_export(input_csv, rows, args.seed)
+        for module_name in args.modules.split(","):
+            for operation in operations:
+                if operation == "xlsm" and rows > SHEET_ROWS:
+                    print(f"  {module_name} xlsm: {rows} rows don't fit in a sheet")
+                    continue
+                suffix = ".xlsm" if operation == "xlsm" else ".csv"
+                result = run_isolated(
+                    module_name,
+                    operation,
+                    input_csv,
+                    template,
+                    output + suffix,
+                    args.workers,
+                )
+                if result is None:
+                    continue
+                result.update(module=module_name, operation=operation, rows=rows)
+                results.append(result)
+                print(
+                    f"{module_name:<30}{operation:<11}{rows:>10}"
+                    f"{result['seconds']:>10.2f}{rows / result['seconds']:>11.0f}"
+                    f"{result['peak_rss'] / 2**20:>10.1f}"
+                )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
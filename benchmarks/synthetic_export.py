@@ -0,0 +1,457 @@
+"""Seeded generator of synthetic Leadcast inventory exports.
+
+Real exports can't be shared, so benchmarks run on generated ones. Every
+column the translators read is present, plus a few they don't (real exports
+carry many more), with value distributions modelled on the Lancaster export:
+pipe-delimited materials and material methods, several verification dates
+per field-verified line, duplicate street addresses from split lines,
+TRAINING rows, blank predict scores and a water main note on some lines.
+
+The same seed and row count always give the same file.
+
+Usage (from the repository root):
+    python -m benchmarks.synthetic_export --rows 100k -o export.csv [--seed 0]
+    python -m benchmarks.synthetic_export --template -o template.xlsm
+"""
+
+import argparse
+import csv
+import io
+import random
+import zipfile
+from typing import Iterator, List
+
+# Named sizes accepted wherever a row count is
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000, "5M": 5_000_000}
+
+COLUMNS = [
+    "ID",
+    "PWS ID",
+    "Account Number",
+    "Street",
+    "City",
+    "Zipcode",
+    "Latitude",
+    "Longitude",
+    "Building Type",
+    "Utility Materials",
+    "Private Materials",
+    "Connector Materials",
+    "Utility Previously Lead",
+    "Utility Installation Dates",
+    "Private Installation Dates",
+    "Utility Diameters",
+    "Private Diameters",
+    "Predict Score Utility",
+    "Predict Score Private",
+    "Utility Status",
+    "Private Status",
+    "Utility Material Method",
+    "Private Material Method",
+    "Water Main Install Year",
+    "Utility Field Verified",
+    "Private Field Verified",
+    "Utility Verification date",
+    "Private Verification Date",
+    "Utility Verification Method",
+    "Private Verification Method",
+    "Utility Notes",
+    "Private Notes",
+    "POE Filter",
+    "Lead Solder Present",
+    "Other Fittings Containing Lead",
+    "Plumbing Material",
+    "Plumbing Contains Lead Solder",
+    "Sample Site Status",
+    "Last Updated",
+]
+
+PWS_ID = "7360058"
+TRAINING_SHARE = 0.01
+# Share of lines that are another segment of the previous address
+SPLIT_LINE_SHARE = 0.08
+
+STREETS = [
+    "Queen",
+    "King",
+    "Duke",
+    "Prince",
+    "Orange",
+    "Chestnut",
+    "Walnut",
+    "Lemon",
+    "James",
+    "Lime",
+    "Mulberry",
+    "Charlotte",
+    "Manor",
+    "New Holland",
+    "Columbia",
+    "Marietta",
+    "Harrisburg",
+    "Fruitville",
+    "Lititz",
+    "Millersville",
+    "Strasburg",
+    "Conestoga",
+    "Ann",
+    "Plum",
+    "Shippen",
+    "Christian",
+    "Water",
+    "Arch",
+    "Church",
+    "Filbert",
+    "Grant",
+    "Hershey",
+    "Janet",
+    "Lafayette",
+    "Marion",
+    "Nevin",
+    "Pershing",
+    "Ruby",
+    "Stevens",
+    "Woodward",
+]
+SUFFIXES = ["St", "Ave", "Rd", "Pike", "Ln", "Dr"]
+DIRECTIONS = ["", "", "N ", "S ", "E ", "W "]
+CITIES = [
+    ("Lancaster", "17602", 0.55),
+    ("Lancaster", "17603", 0.25),
+    ("Lancaster Township", "17603", 0.1),
+    ("Manheim Township", "17601", 0.1),
+]
+
+BUILDING_TYPES = [
+    ("Single-Family", 0.78),
+    ("Multi-Family", 0.12),
+    ("Commercial", 0.05),
+    ("Industrial", 0.01),
+    ("Elementary School", 0.005),
+    ("School Non-Elementary", 0.005),
+    ("Day Care", 0.01),
+    ("Residential & In-Home Day Care", 0.01),
+    ("Government", 0.01),
+]
+MATERIALS = [
+    ("CU", 0.33),
+    ("UNK", 0.2),
+    ("PL", 0.1),
+    ("UNK-NL", 0.08),
+    ("GALV", 0.06),
+    ("LD", 0.04),
+    ("DI", 0.04),
+    ("BR", 0.03),
+    ("PVC", 0.03),
+    ("HDPE", 0.03),
+    ("CI", 0.02),
+    ("PE", 0.02),
+    ("AC", 0.02),
+]
+# Share of sides with several " | " separated materials
+MIXED_MATERIAL_SHARE = 0.12
+CONNECTORS = [("", 0.5), ("UNK", 0.3), ("CU", 0.13), ("LD", 0.05), ("GALV", 0.02)]
+PREVIOUSLY_LEAD = [("Unknown", 0.5), ("No", 0.4), ("Yes", 0.05), ("", 0.05)]
+DIAMETERS = [
+    ("0.75", 0.45),
+    ("1", 0.25),
+    ("99", 0.15),
+    ("1.5", 0.05),
+    ("2", 0.04),
+    ("4", 0.03),
+    ("6", 0.03),
+]
+KNOWN_METHODS = [
+    ("Records - Other", 0.3),
+    ("Installation Records", 0.2),
+    ("Field Inspection", 0.15),
+    ("Installation Date After Lead Ban", 0.15),
+    ('Diameter > 2"', 0.05),
+    ("Records Validation", 0.05),
+    ("Predictive Model", 0.05),
+    ("Replacement Record", 0.05),
+]
+VERIFICATION_METHODS = [
+    ("Records - Other", 0.35),
+    ("Predictive Model", 0.2),
+    ("Statistical Analysis", 0.05),
+    ("Installation Date After Lead Ban", 0.1),
+    ("Other", 0.05),
+    ("", 0.25),
+]
+YES_NO_UNKNOWN = [("Unknown", 0.6), ("No", 0.3), ("Yes", 0.1)]
+PLUMBING_MATERIALS = [("Unknown", 0.6), ("CU", 0.3), ("GALV", 0.06), ("LD", 0.04)]
+WATER_MAIN_NOTE = (
+    "Utility side installation date is estimated from installation date of "
+    "nearest water main"
+)
+FREE_NOTES = [
+    "Curb stop not found",
+    "Owner reports copper, not verified",
+    "See work order, service renewed",
+    'Meter pit, 5/8" meter',
+    "Line shared with rear unit\nconfirm at next visit",
+]
+
+
+def parse_size(text: str) -> int:
+    """Row count from a named size (10k, 100k, 1M, 5M) or a plain number"""
+    if text in SIZES:
+        return SIZES[text]
+    return int(text.replace("_", ""))
+
+
+def _weighted(choices):
+    values = [value for value, _ in choices]
+    weights = [weight for _, weight in choices]
+    return values, weights
+
+
+class _Picker:
+    """Weighted choices drawn in blocks, which is several times faster per value"""
+
+    def __init__(self, rng: random.Random, choices, block=4096):
+        self.rng = rng
+        self.values, self.weights = _weighted(choices)
+        self.block = block
+        self.pending = []
+
+    def __call__(self) -> str:
+        if not self.pending:
+            self.pending = self.rng.choices(self.values, self.weights, k=self.block)
+        return self.pending.pop()
+
+
+def _date(rng: random.Random, first_year: int, last_year: int) -> str:
+    return f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/{rng.randint(first_year, last_year)}"
+
+
+def _install_year(rng: random.Random) -> int:
+    # Most of the city was piped before the war, with a second wave after it
+    if rng.random() < 0.6:
+        return int(rng.triangular(1885, 1945, 1920))
+    return int(rng.triangular(1946, 2025, 1965))
+
+
+def generate_rows(rows: int, seed: int = 0) -> Iterator[List[str]]:
+    """Yield rows of values in COLUMNS order
+
+    Args:
+        rows (int): Number of rows, TRAINING rows included
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Yields:
+        Iterator[List[str]]: One export row
+    """
+    rng = random.Random(seed)
+    building_type = _Picker(rng, BUILDING_TYPES)
+    city = _Picker(rng, [((c, z), w) for c, z, w in CITIES])
+    material = _Picker(rng, MATERIALS)
+    connector = _Picker(rng, CONNECTORS)
+    previously_lead = _Picker(rng, PREVIOUSLY_LEAD)
+    diameter = _Picker(rng, DIAMETERS)
+    known_method = _Picker(rng, KNOWN_METHODS)
+    verification_method = _Picker(rng, VERIFICATION_METHODS)
+    yes_no_unknown = _Picker(rng, YES_NO_UNKNOWN)
+    plumbing_material = _Picker(rng, PLUMBING_MATERIALS)
+    material_values, material_weights = _weighted(MATERIALS)
+    # Enough distinct addresses that repeats mostly come from split lines
+    addresses = max(rows, 1000)
+    street = None
+
+    def side_materials():
+        if rng.random() < MIXED_MATERIAL_SHARE:
+            picked = rng.choices(material_values, material_weights, k=3)
+            return " | ".join(dict.fromkeys(picked[: rng.randint(2, 3)]))
+        return material()
+
+    def status(materials):
+        if "UNK" in materials.split(" | "):
+            return "Lead Status Unknown"
+        if "LD" in materials:
+            return "Lead"
+        if "GALV" in materials:
+            return "Galvanized Requiring Replacement"
+        return "Non-Lead"
+
+    def material_method(side_status):
+        if side_status == "Lead Status Unknown":
+            return ""
+        if rng.random() < 0.15:
+            return f"{known_method()} | {known_method()}"
+        return known_method()
+
+    def installation_date():
+        draw = rng.random()
+        if draw < 0.3:
+            return ""
+        if draw < 0.33:
+            # Leadcast's placeholder for "date unknown"
+            return "1/1/1970"
+        year = _install_year(rng)
+        return _date(rng, year, year)
+
+    def predict_score():
+        if rng.random() < 0.3:
+            return ""
+        return f"{rng.random():.3f}"
+
+    def field_verified():
+        return "Yes" if rng.random() < 0.25 else "No"
+
+    def verification_dates(verified):
+        if verified != "Yes":
+            return "" if rng.random() < 0.9 else _date(rng, 2016, 2025)
+        return " | ".join(
+            _date(rng, 2016, 2025) for _ in range(rng.choice((1, 1, 1, 2, 3)))
+        )
+
+    def notes(water_main_year):
+        draw = rng.random()
+        if water_main_year and draw < 0.15:
+            return f"{WATER_MAIN_NOTE} ({water_main_year})"
+        if draw > 0.95:
+            return rng.choice(FREE_NOTES)
+        return ""
+
+    for index in range(rows):
+        if street is None or rng.random() >= SPLIT_LINE_SHARE:
+            address = rng.randrange(addresses)
+            number, address = address % 3000 + 1, address // 3000
+            name = STREETS[address % len(STREETS)]
+            suffix = SUFFIXES[address // len(STREETS) % len(SUFFIXES)]
+            direction = rng.choice(DIRECTIONS)
+            street = f"{number} {direction}{name} {suffix}"
+            if rng.random() < 0.3:
+                # Addresses are typed in all sorts of case
+                street = rng.choice((street.upper(), street.lower()))
+            line_id = f"{100000 + index}"
+        else:
+            # Another segment of the same line: same street, lettered ID
+            line_id = f"{100000 + index}{rng.choice('AB')}"
+        city_name, zipcode = city()
+
+        utility_materials = side_materials()
+        private_materials = side_materials()
+        utility_status = status(utility_materials)
+        private_status = status(private_materials)
+        water_main_year = str(_install_year(rng)) if rng.random() < 0.6 else ""
+        utility_verified = field_verified()
+        private_verified = field_verified()
+
+        yield [
+            line_id,
+            "TRAINING" if rng.random() < TRAINING_SHARE else PWS_ID,
+            f"{rng.randrange(10**9):09d}",
+            street,
+            city_name,
+            zipcode,
+            f"{40.0379 + rng.uniform(-0.03, 0.03):.6f}",
+            f"{-76.3055 + rng.uniform(-0.03, 0.03):.6f}",
+            building_type(),
+            utility_materials,
+            private_materials,
+            connector(),
+            previously_lead(),
+            installation_date(),
+            installation_date(),
+            diameter(),
+            diameter(),
+            predict_score(),
+            predict_score(),
+            utility_status,
+            private_status,
+            material_method(utility_status),
+            material_method(private_status),
+            water_main_year,
+            utility_verified,
+            private_verified,
+            verification_dates(utility_verified),
+            verification_dates(private_verified),
+            "Visual Inspection" if utility_verified == "Yes" else verification_method(),
+            "Visual Inspection" if private_verified == "Yes" else verification_method(),
+            notes(water_main_year),
+            notes(""),
+            yes_no_unknown(),
+            yes_no_unknown(),
+            yes_no_unknown(),
+            plumbing_material(),
+            yes_no_unknown(),
+            "Yes" if rng.random() < 0.02 else "No",
+            _date(rng, 2023, 2025),
+        ]
+
+
+def write_export(path: str, rows: int, seed: int = 0) -> str:
+    """Write a synthetic export of rows rows to path, returns path"""
+    with open(path, mode="w", newline="", encoding="utf-8") as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(COLUMNS)
+        writer.writerows(generate_rows(rows, seed))
+    return path
+
+
+def write_template(path: str, sheet_name: str = "Detailed Inventory") -> str:
+    """Write a stand-in for the DEP form: a macro-enabled workbook with the
+    inventory sheet, a styled header and a placeholder VBA project"""
+    import openpyxl
+    from openpyxl.styles import Font
+
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "Instructions"
+    workbook.active["A1"] = "Synthetic template for benchmarks"
+    worksheet = workbook.create_sheet(sheet_name)
+    for row in range(1, 10):
+        worksheet.cell(row=row, column=5, value=f"Header {row}").font = Font(bold=True)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    # Turn the .xlsx into an .xlsm the way Excel lays one out
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(
+        path, "w", zipfile.ZIP_DEFLATED
+    ) as target:
+        for info in source.infolist():
+            data = source.read(info)
+            if info.filename == "[Content_Types].xml":
+                data = data.replace(
+                    b"application/vnd.openxmlformats-officedocument."
+                    b"spreadsheetml.sheet.main+xml",
+                    b"application/vnd.ms-excel.sheet.macroEnabled.main+xml",
+                )
+                data = data.replace(
+                    b"</Types>",
+                    b'<Default Extension="bin" '
+                    b'ContentType="application/vnd.ms-office.vbaProject"/></Types>',
+                )
+            elif info.filename == "xl/_rels/workbook.xml.rels":
+                data = data.replace(
+                    b"</Relationships>",
+                    b'<Relationship Id="rIdVBA" Type="http://schemas.microsoft.com/'
+                    b'office/2006/relationships/vbaProject" Target="vbaProject.bin"/>'
+                    b"</Relationships>",
+                )
+            target.writestr(info, data)
+        target.writestr("xl/vbaProject.bin", b"\xd0\xcf\x11\xe0" + bytes(508))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument(
+        "--rows", type=parse_size, default=SIZES["10k"], help="10k, 100k, 1M, 5M or N"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--template", action="store_true", help="Write a DEP form stand-in instead"
+    )
+    args = parser.parse_args()
+
+    if args.template:
+        write_template(args.output)
+    else:
+        write_export(args.output, args.rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+"""Shared building blocks for translating Leadcast exports into the PA DEP
+service line inventory form."""
@@ -0,0 +1,5 @@
+import sys
+
+from leadcast.cli import main
+
+sys.exit(main())
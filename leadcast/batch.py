@@ -0,0 +1,183 @@
+"""Run many translations in one warm process.
+
+A manifest is a CSV with one job per row:
+
+    export,profile,output,template
+    exports/lancaster-2025-q1.csv,lancaster_2025,out/lancaster.xlsm,forms/FORM_2025.xlsm
+    exports/reading-2024.csv,reading_2024_v2,out/reading.csv,
+
+Relative paths are taken from the manifest's directory. The output's extension
+picks the format as on the command line (CSV, .xlsm, Parquet or Arrow), and
+template is only needed for .xlsm outputs.
+
+Jobs share everything that is built once per process: the imports, the
+compiled profiles and the split workbook templates. With workers, each pool
+process runs whole jobs and keeps its own caches. Jobs start largest export
+first, so a big export doesn't start last and hold up the end of the batch.
+"""
+
+import csv
+import os
+import time
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from leadcast import convert
+from leadcast.streams import output_mode
+
+MANIFEST_COLUMNS = ("export", "profile", "output", "template")
+
+
+class Job(NamedTuple):
+    """One translation of a batch"""
+
+    export: str
+    profile: str
+    output: str
+    template: Optional[str] = None
+
+
+class JobResult(NamedTuple):
+    """What became of a job: rows written, or the error that stopped it"""
+
+    job: Job
+    rows: Optional[int]
+    seconds: float
+    error: Optional[str] = None
+
+
+def read_manifest(path: str) -> List[Job]:
+    """Jobs of a manifest CSV, in file order
+
+    Raises:
+        ValueError: The manifest lacks a column, or a job lacks its export,
+            profile or output, names an unknown profile or an .xlsm output
+            without a template
+    """
+    base = os.path.dirname(os.path.abspath(path))
+
+    def resolve(value: str) -> Optional[str]:
+        return os.path.join(base, value) if value else None
+
+    jobs = []
+    with open(path, mode="r", newline="", encoding="utf-8") as infile:
+        reader = csv.DictReader(infile)
+        missing = [
+            c for c in MANIFEST_COLUMNS[:3] if c not in (reader.fieldnames or ())
+        ]
+        if missing:
+            raise ValueError(
+                f"Manifest {path} is missing column(s): {', '.join(missing)}"
+            )
+        for line, row in enumerate(reader, start=2):
+            # A short row has None for its missing columns
+            export, profile, output, template = (
+                (row.get(column) or "").strip() for column in MANIFEST_COLUMNS
+            )
+            if not (export or profile or output or template):
+                continue
+            missing = [
+                column
+                for column, value in zip(MANIFEST_COLUMNS, (export, profile, output))
+                if not value
+            ]
+            if missing:
+                raise ValueError(f"{path}:{line}: no {', '.join(missing)}")
+            job = Job(resolve(export), profile, resolve(output), resolve(template))
+            try:
+                convert.get_profile(job.profile)
+            except ValueError as error:
+                raise ValueError(f"{path}:{line}: {error}") from None
+            if output_mode(job.output) == "xlsm" and not job.template:
+                raise ValueError(f"{path}:{line}: an .xlsm output needs a template")
+            jobs.append(job)
+    return jobs
+
+
+def schedule(jobs: Iterable[Job]) -> List[Job]:
+    """Jobs largest export first; exports that can't be found go first and fail fast"""
+
+    def size(job: Job) -> float:
+        try:
+            return os.path.getsize(job.export)
+        except OSError:
+            return float("inf")
+
+    return sorted(jobs, key=size, reverse=True)
+
+
+def run_job(job: Job, cache=None) -> int:
+    """Translate one job in this process, returns the number of rows written"""
+    mode = output_mode(job.output)
+    if mode == "csv":
+        return convert.translate_to_csv(job.profile, job.export, job.output)
+    if mode == "xlsm":
+        return convert.translate_to_xlsm(
+            job.profile, job.export, job.template, job.output, cache=cache
+        )
+    return convert.translate_to_arrow(job.profile, job.export, job.output, mode)
+
+
+def _timed_job(job: Job, cache) -> JobResult:
+    start = time.perf_counter()
+    try:
+        rows = run_job(job, cache)
+    except Exception as error:  # One bad export doesn't stop the batch
+        return JobResult(
+            job, None, time.perf_counter() - start, f"{type(error).__name__}: {error}"
+        )
+    return JobResult(job, rows, time.perf_counter() - start)
+
+
+# The template cache of a pool process, shared by every job it runs
+_worker_cache = None
+
+
+def _worker_job(job: Job) -> JobResult:
+    global _worker_cache
+    if _worker_cache is None:
+        from leadcast.template_cache import TemplateCache
+
+        _worker_cache = TemplateCache()
+    return _timed_job(job, _worker_cache)
+
+
+def run_batch(
+    jobs: Iterable[Job], workers: Optional[int] = None
+) -> Iterator[JobResult]:
+    """Run jobs largest first, yielding each result as its job finishes
+
+    Args:
+        jobs (Iterable[Job]): The batch
+        workers (Optional[int], optional): Pool processes running jobs side by
+            side. Defaults to None, one job at a time in this process.
+    """
+    jobs = schedule(jobs)
+    if workers is None or workers == 1:
+        from leadcast.template_cache import TemplateCache
+
+        cache = TemplateCache()
+        for job in jobs:
+            yield _timed_job(job, cache)
+        return
+
+    # Imported here: multiprocessing is slow to import and serial runs never need it
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from concurrent.futures.process import BrokenProcessPool
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs) or 1)) as pool:
+        # The pool hands out jobs in submission order, largest first
+        futures = {pool.submit(_worker_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool as error:
+                # A pool process died (killed, crashed): its job and the jobs
+                # still waiting fail with the pool, the results in hand stand
+                result = JobResult(
+                    futures[future],
+                    None,
+                    time.perf_counter() - start,
+                    f"{type(error).__name__}: {error}",
+                )
+            yield result
@@ -0,0 +1,159 @@
+"""Checkpoints for long workbook runs.
+
+A workbook is only readable once its zip is complete, so a run that dies at
+90% used to lose all of its work. With a checkpoint (``--checkpoint run.json``
+on the command line) the export is translated a byte range at a time (see
+core.translate_chunks) and every translated range is appended to a spool file
+beside the state file. Every CHECKPOINT_BYTES of export, the state file
+records how far the run has got: the export's byte offset, the rows spooled
+and the spool's length, the counters and the Street Address 2 labeler's
+address counts.
+
+A restarted run with the same export, profile and output finds the state
+file, replays the spooled rows into the workbook and carries on translating
+from the byte offset, so the export before it is neither read nor translated
+again. The workbook itself is rewritten from the start. Both files are
+removed once the workbook is saved. Exports must be uncompressed, since they
+are read at byte offsets.
+"""
+
+import json
+import os
+import pickle
+from typing import Iterator, List, Optional
+
+from leadcast.chunks import chunk_size
+from leadcast.core import SKIPPED, Progress, as_compiled, translate_chunks
+from leadcast.streams import compression
+
+STATE_VERSION = 1
+# Export bytes between saves of the state file
+CHECKPOINT_BYTES = 64 << 20
+
+
+class Checkpoint:
+    """State and spool of one resumable run
+
+    Args:
+        path (str): State file; the spool is path + ".rows"
+        profile: A registered Profile or its name
+        export (str): Uncompressed Leadcast export
+        output (str): The output the rows are for
+    """
+
+    def __init__(self, path: str, profile, export: str, output: str):
+        if compression(export) is not None:
+            raise ValueError("Checkpointed runs need an uncompressed export")
+        self.path = path
+        self.spool = path + ".rows"
+        self.compiled = as_compiled(profile)
+        self.export = export
+        stat = os.stat(export)
+        self.key = {
+            "version": STATE_VERSION,
+            "profile": self.compiled.profile.name,
+            "export": os.path.abspath(export),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "output": os.path.abspath(output),
+        }
+
+    def load(self) -> Optional[dict]:
+        """The saved state, if there is one for this same run"""
+        try:
+            with open(self.path, mode="r", encoding="utf-8") as infile:
+                state = json.load(infile)
+        except (OSError, ValueError):
+            return None
+        if any(state.get(name) != value for name, value in self.key.items()):
+            return None
+        try:
+            if os.path.getsize(self.spool) < state["spool_bytes"]:
+                return None
+        except OSError:
+            return None
+        return state
+
+    def _save(self, spool, progress: Progress, chunk_bytes: int):
+        spool.flush()
+        os.fsync(spool.fileno())
+        state = {
+            **self.key,
+            "chunk_bytes": chunk_bytes,
+            "offset": progress.offset,
+            "rows": progress.rows,
+            "spool_bytes": spool.tell(),
+            "counters": progress.counters,
+            "address_count": progress.address_count,
+        }
+        saving = self.path + ".saving"
+        with open(saving, mode="w", encoding="utf-8") as outfile:
+            json.dump(state, outfile)
+        os.replace(saving, self.path)
+
+    def _replay(self, spool_bytes: int) -> Iterator[List]:
+        with open(self.spool, "rb") as spool:
+            while spool.tell() < spool_bytes:
+                yield from pickle.load(spool)
+
+    def rows(self, workers=None, report=None, tolerant=False) -> Iterator[List]:
+        """The run's rows: the spooled ones, then the rest of the export's
+
+        Raises:
+            MissingColumnsError: The export lacks a required column
+        """
+        state = self.load()
+        resume = None
+        if state is None:
+            chunk_bytes = chunk_size(self.key["size"], workers or 1)
+            spool_bytes = 0
+        else:
+            chunk_bytes = state["chunk_bytes"]
+            spool_bytes = state["spool_bytes"]
+            resume = Progress(
+                state["offset"],
+                state["rows"],
+                state["counters"],
+                state["address_count"],
+            )
+            print(f"Resuming after row {resume.rows} of {self.export}")
+            if report is not None:
+                report.rows_seen += resume.rows + resume.counters.get(SKIPPED, 0)
+            yield from self._replay(spool_bytes)
+
+        with open(self.spool, "r+b" if state else "wb") as spool:
+            # Rows spooled after the last save are translated again
+            spool.truncate(spool_bytes)
+            spool.seek(spool_bytes)
+            pending = []
+            saved = [resume.offset if resume else 0]
+
+            def progress(done: Progress):
+                pickle.dump(pending, spool, pickle.HIGHEST_PROTOCOL)
+                pending.clear()
+                if done.offset - saved[0] >= CHECKPOINT_BYTES or (
+                    done.offset >= self.key["size"]
+                ):
+                    self._save(spool, done, chunk_bytes)
+                    saved[0] = done.offset
+
+            for values in translate_chunks(
+                self.compiled,
+                self.export,
+                workers,
+                chunk_bytes,
+                report,
+                tolerant,
+                resume,
+                progress,
+            ):
+                pending.append(values)
+                yield values
+
+    def finish(self):
+        """Forget the run, once its output is saved"""
+        for path in (self.path, self.spool):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
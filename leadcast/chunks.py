@@ -0,0 +1,100 @@
+"""Byte-range chunks of an uncompressed export, for parsing in parallel.
+
+The export is memory-mapped and cut at record boundaries into chunks of about
+CHUNK_BYTES. A boundary is a line end outside any quoted field: quotes are
+counted from the start of the chunk, and a doubled quote inside a field counts
+twice, so an odd count means the newline belongs to a multi-line comment.
+
+Workers get only (path, start, end) and map the file themselves, so the raw
+bytes are never pickled between processes. A chunk decodes and parses exactly
+as the same lines would through open(path) and csv.reader.
+"""
+
+import csv
+import io
+import mmap
+import os
+from typing import List, Optional, Tuple
+
+# Bytes per chunk; big enough to amortise a task, small enough to balance
+CHUNK_BYTES = 8 << 20
+# Chunks per worker when the export is small enough to want smaller ones
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_BYTES = 256 << 10
+
+
+def record_end(mapped, position: int, quotes: int = 0) -> int:
+    """Offset just past the first line end from position outside quoted fields
+
+    Args:
+        mapped: The export's bytes, usually an mmap
+        position (int): Where to start looking
+        quotes (int, optional): Quotes counted between the last known boundary
+            and position. Defaults to 0, position is a boundary.
+
+    Returns:
+        int: The boundary, or the end of the file
+    """
+    while True:
+        newline = mapped.find(b"\n", position)
+        if newline < 0:
+            return len(mapped)
+        quotes += mapped[position:newline].count(b'"')
+        if quotes % 2 == 0:
+            return newline + 1
+        position = newline + 1
+
+
+def chunk_size(size: int, workers: int) -> int:
+    """Chunk size for an export of size bytes split between workers"""
+    return max(MIN_CHUNK_BYTES, min(CHUNK_BYTES, size // (workers * CHUNKS_PER_WORKER)))
+
+
+def _text(data: bytes) -> io.StringIO:
+    # newline=None turns \r\n into \n, as open() does in text mode
+    return io.StringIO(data.decode("utf-8"), newline=None)
+
+
+def split_export(
+    path: str,
+    chunk_bytes: Optional[int] = None,
+    workers: int = 1,
+    start: Optional[int] = None,
+) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """The export's header and the (start, end) byte ranges of its data rows
+
+    Args:
+        path (str): Uncompressed CSV export
+        chunk_bytes (Optional[int], optional): Target chunk size. Defaults to
+            None, chunk_size() of the export for the workers.
+        workers (int, optional): Workers the chunks are for. Defaults to 1.
+        start (Optional[int], optional): Boundary to start the ranges at, the
+            end of an earlier range. Defaults to None, the first data row.
+    """
+    with open(path, "rb") as infile:
+        if os.fstat(infile.fileno()).st_size == 0:
+            return [], []
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            chunk_bytes = chunk_bytes or chunk_size(size, workers)
+            header_end = record_end(mapped, 0)
+            header = next(csv.reader(_text(mapped[:header_end])), [])
+            start = header_end if start is None else max(start, header_end)
+            ranges = []
+            while start < size:
+                candidate = min(start + chunk_bytes, size)
+                if candidate < size:
+                    quotes = mapped[start:candidate].count(b'"')
+                    candidate = record_end(mapped, candidate, quotes)
+                ranges.append((start, candidate))
+                start = candidate
+    return header, ranges
+
+
+def read_chunk(path: str, start: int, end: int) -> csv.reader:
+    """csv.reader rows of the export between two boundaries from split_export()"""
+    with open(path, "rb") as infile, mmap.mmap(
+        infile.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        data = mapped[start:end]
+    return csv.reader(_text(data))
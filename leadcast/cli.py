@@ -0,0 +1,351 @@
+"""Command line entry point.
+
+Usage:
+    python -m leadcast EXPORT.csv OUTPUT.csv [--profile lancaster_2025]
+    python -m leadcast EXPORT.csv OUTPUT.xlsm --template FORM.xlsm [--workers 4]
+    python -m leadcast EXPORT.csv OUTPUT.xlsm --template FORM.xlsm --checkpoint run.json
+    python -m leadcast EXPORT.csv OUTPUT.parquet
+    python -m leadcast EXPORT.csv OUTPUT.csv --report run.json
+    python -m leadcast EXPORT.csv [OUTPUT.xlsm ...] --validate [--error-index bad.csv]
+    python -m leadcast EXPORT.csv OUTPUT.csv --quarantine bad.csv
+    python -m leadcast bad.csv OUTPUT.csv --merge
+    python -m leadcast EXPORT.csv OUTPUT.csv --incremental rows.db
+    python -m leadcast EXPORT.csv OUTPUT.xlsm --template FORM.xlsm --previous SUBMITTED.xlsm
+    python -m leadcast EXPORT.csv OUTPUT.csv --store inventories.db
+    python -m leadcast EXPORT.csv --translate-one ID
+    python -m leadcast --diff PREVIOUS.xlsm NEW.csv [CHANGES.csv] [--sorted]
+    python -m leadcast --batch MANIFEST.csv [--workers 2]
+    python -m leadcast --list-profiles
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from leadcast.profiles import LANCASTER_2025, PROFILES
+from leadcast.streams import MODES, output_mode
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m leadcast",
+        description="Translate a Leadcast inventory export into the PA DEP service "
+        "line inventory form.",
+    )
+    parser.add_argument("input", nargs="?", help="Leadcast export (CSV)")
+    parser.add_argument(
+        "output", nargs="?", help="Translated CSV, workbook, Parquet or Arrow file"
+    )
+    parser.add_argument(
+        "-p",
+        "--profile",
+        default=LANCASTER_2025.name,
+        choices=list(PROFILES),
+        metavar="NAME",
+        help=f"Utility and form revision. Defaults to {LANCASTER_2025.name}.",
+    )
+    parser.add_argument(
+        "-m",
+        "--mode",
+        choices=MODES,
+        help="Output format. Defaults to the output's extension: .xlsm, "
+        ".parquet/.pq, .arrow/.feather/.ipc, else csv.",
+    )
+    parser.add_argument(
+        "-t", "--template", help="Blank DEP form to copy, required for xlsm"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes. Defaults to translating in this process.",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="MANIFEST",
+        help="Run every job of a manifest CSV (export,profile,output,template) in "
+        "one process, or in --workers processes side by side",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="JSON",
+        help="Time each stage and write the timings and row counters to JSON",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check the export first and stop before translating if a value "
+        "would stop the run. Without an output, only check it.",
+    )
+    parser.add_argument(
+        "--error-index",
+        metavar="CSV",
+        help="With --validate, save every problem found (row, ID, column, value) "
+        "to CSV",
+    )
+    parser.add_argument(
+        "--quarantine",
+        metavar="CSV",
+        help="Set rows that don't translate aside in CSV, with their errors, "
+        "and translate the rest",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="The input is a quarantine file, fixed: translate its rows into "
+        "the existing CSV output",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="JSON",
+        help="xlsm only: save the run's progress in JSON (and its rows beside "
+        "it), and carry on from there if the run is started again",
+    )
+    parser.add_argument(
+        "--incremental",
+        metavar="DB",
+        help="Translate only the rows that changed since the last run with the "
+        "SQLite cache DB, and keep this run's rows in it",
+    )
+    parser.add_argument(
+        "--previous",
+        metavar="INVENTORY",
+        help="Set each line's Record Type (Update, Add, Inactive) against "
+        "INVENTORY, the CSV or workbook submitted last (2024 forms)",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DB",
+        help="Load the translated rows into a new, indexed table of the SQLite "
+        "database DB as well",
+    )
+    parser.add_argument(
+        "--translate-one",
+        metavar="ID",
+        help="Translate the one line of the export with service line ID, found "
+        "through an index kept beside the export, and print it",
+    )
+    parser.add_argument(
+        "--diff",
+        nargs=2,
+        metavar=("PREVIOUS", "NEW"),
+        help="Compare two translated inventories (CSV or workbook) by service "
+        "line ID; the changes go to the first positional argument, if given",
+    )
+    parser.add_argument(
+        "--sorted",
+        action="store_true",
+        help="With --diff, both inventories are sorted by ID: merge them in "
+        "one pass",
+    )
+    parser.add_argument(
+        "--list-profiles", action="store_true", help="List the profiles and exit"
+    )
+    return parser
+
+
+def _run_batch(manifest: str, workers: Optional[int]) -> int:
+    from leadcast import batch
+
+    try:
+        jobs = batch.read_manifest(manifest)
+    except (OSError, ValueError) as error:
+        print(f"Cannot read manifest: {error}", file=sys.stderr)
+        return 2
+    failed = 0
+    for result in batch.run_batch(jobs, workers):
+        if result.error is None:
+            print(
+                f"done   {result.job.output}: {result.rows} rows "
+                f"in {result.seconds:.1f}s"
+            )
+        else:
+            failed += 1
+            print(f"FAILED {result.job.export}: {result.error}", file=sys.stderr)
+    print(f"{len(jobs) - failed} of {len(jobs)} jobs done")
+    return 1 if failed else 0
+
+
+def _validate(profile: str, export: str, error_index: Optional[str]) -> bool:
+    """Check an export, printing what is wrong; False if it can't be translated"""
+    from leadcast import validate
+
+    issues = validate.validate_file(profile, export)
+    if error_index:
+        validate.write_index(issues, error_index)
+    if issues:
+        print(validate.summary(issues), file=sys.stderr)
+    errors = validate.errors(issues)
+    print(
+        f"{export}: {len(errors)} error(s), {len(issues) - len(errors)} warning(s)",
+        file=sys.stderr if errors else sys.stdout,
+    )
+    return not errors
+
+
+def _translate_one(profile: str, export: str, line_id: str) -> int:
+    from leadcast.core import PWS_ID, translate_record
+    from leadcast.id_index import find_record
+    from leadcast.validate import validate_records
+
+    try:
+        record = find_record(profile, export, line_id)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 2
+    if record is None:
+        print(f"{export} has no line {line_id!r}", file=sys.stderr)
+        return 1
+    profile = PROFILES[profile]
+    if profile.skip_training and record[PWS_ID] == "TRAINING":
+        print(f"A TRAINING line, left out of {profile.name} translations")
+    for issue in validate_records(profile, [record]):
+        print(f"{issue.severity}: {issue.column} {issue.value!r}: {issue.problem}")
+    try:
+        values = translate_record(profile, record)
+    except Exception as error:  # Shown as a quarantine file would show it
+        print(f"{type(error).__name__}: {error}", file=sys.stderr)
+        return 1
+    for column, value in zip(profile.schema.columns, values):
+        print(f"{column}: {'' if value is None else value}")
+    return 0
+
+
+def _merge(profile: str, quarantine_file: str, output: str) -> int:
+    from leadcast.quarantine import merge
+
+    merged, failing = merge(profile, quarantine_file, output)
+    print(f"{merged} row(s) merged into {output}")
+    if failing:
+        print(f"{failing} row(s) still quarantined in {quarantine_file}")
+        return 1
+    return 0
+
+
+def _run_diff(previous: str, new: str, profile: str, changes, presorted) -> int:
+    from leadcast import diff
+    from leadcast.profiles import PROFILES
+
+    diffs = diff.diff_inventories(previous, new, PROFILES[profile], presorted)
+    try:
+        counts = diff.write_report(diffs, changes or os.devnull)
+    except ValueError as error:
+        print(f"Cannot compare: {error}", file=sys.stderr)
+        return 2
+    print(
+        f"{counts[diff.ADDED]} added, {counts[diff.REMOVED]} removed, "
+        f"{counts[diff.CHANGED]} changed"
+    )
+    kinds = (diff.ADDED, diff.REMOVED, diff.CHANGED)
+    for column, count in counts.most_common():
+        if column not in kinds:
+            print(f"  {column}: {count}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    # Positionals may come after options, as in EXPORT -p NAME OUTPUT
+    args = parser.parse_intermixed_args(argv)
+
+    if args.list_profiles:
+        for name, profile in PROFILES.items():
+            print(f"{name:<20} {profile.form} form")
+        return 0
+    if args.diff:
+        if args.output:
+            parser.error("--diff takes one more argument, the changes CSV")
+        return _run_diff(*args.diff, args.profile, args.input, args.sorted)
+    if args.translate_one is not None:
+        if not args.input or args.output:
+            parser.error("--translate-one takes one argument, the export")
+        return _translate_one(args.profile, args.input, args.translate_one)
+    if args.batch:
+        if args.input or args.output:
+            parser.error("--batch takes its inputs and outputs from the manifest")
+        return _run_batch(args.batch, args.workers)
+    if args.error_index and not args.validate:
+        parser.error("--error-index needs --validate")
+    if args.validate and args.input and not args.output:
+        return 0 if _validate(args.profile, args.input, args.error_index) else 1
+    if not args.input or not args.output:
+        parser.error("input and output are required")
+    if args.merge:
+        return _merge(args.profile, args.input, args.output)
+    mode = args.mode or output_mode(args.output)
+    if mode == "xlsm" and not args.template:
+        parser.error("--template is required for xlsm output")
+    if args.checkpoint and mode != "xlsm":
+        parser.error("--checkpoint is for xlsm output")
+    if args.checkpoint and args.incremental:
+        parser.error("--checkpoint and --incremental can't be combined")
+    if args.quarantine and args.previous:
+        parser.error("--quarantine and --previous can't be combined")
+    if args.previous and PROFILES[args.profile].form == LANCASTER_2025.form:
+        parser.error(f"--previous: the {LANCASTER_2025.form} form has no Record Type")
+
+    if args.validate and not _validate(args.profile, args.input, args.error_index):
+        return 1
+
+    # Imported once the arguments are known to be good, so --help stays instant
+    from leadcast import convert
+
+    report = None
+    if args.report:
+        from leadcast.report import RunReport
+
+        report = RunReport(
+            profile=args.profile,
+            mode=mode,
+            input=args.input,
+            output=args.output,
+            workers=args.workers,
+        )
+    if mode == "csv":
+        convert.translate_to_csv(
+            args.profile,
+            args.input,
+            args.output,
+            args.workers,
+            report=report,
+            quarantine=args.quarantine,
+            incremental=args.incremental,
+            previous=args.previous,
+            store=args.store,
+        )
+    elif mode == "xlsm":
+        convert.translate_to_xlsm(
+            args.profile,
+            args.input,
+            args.template,
+            args.output,
+            args.workers,
+            report=report,
+            quarantine=args.quarantine,
+            checkpoint=args.checkpoint,
+            incremental=args.incremental,
+            previous=args.previous,
+            store=args.store,
+        )
+    else:
+        convert.translate_to_arrow(
+            args.profile,
+            args.input,
+            args.output,
+            mode,
+            args.workers,
+            report=report,
+            quarantine=args.quarantine,
+            incremental=args.incremental,
+            previous=args.previous,
+            store=args.store,
+        )
+    if report is not None:
+        report.write(args.report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
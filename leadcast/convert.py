@@ -0,0 +1,357 @@
+"""Export to CSV or to the DEP workbook, for any profile.
+
+Exports are read with leadcast.reader, keeping only the columns the profile
+reads. The xlsm writers and the process pool are imported on their own paths
+only, so CSV runs don't pay for openpyxl or multiprocessing at startup.
+Compressed exports and CSV outputs (.gz, .bz2, .zst, .zip) are handled by
+leadcast.streams. Parquet and Arrow outputs need pyarrow, imported only then.
+"""
+
+import csv
+from contextlib import contextmanager, nullcontext
+from typing import Iterable, Iterator, List, TextIO
+
+from leadcast import core
+from leadcast.profiles import PROFILES, Profile
+from leadcast.reader import read_records
+from leadcast.streams import compression, open_input, open_output
+
+
+def get_profile(profile) -> Profile:
+    """A Profile, looked up in PROFILES when given by name"""
+    if isinstance(profile, str):
+        try:
+            return PROFILES[profile]
+        except KeyError:
+            raise ValueError(
+                f"Unknown profile {profile!r}, expected one of {', '.join(PROFILES)}"
+            ) from None
+    return profile
+
+
+def translate_file(
+    profile: Profile, infile: TextIO, workers=None, report=None, tolerant=False
+) -> Iterator[List]:
+    """DEP value lists of an open export, reading only the columns the profile needs"""
+    records = read_records(
+        infile, core.as_compiled(profile).input_columns, core.OPTIONAL_INPUT_COLUMNS
+    )
+    return core.translate_records(
+        profile, records, workers, report=report, tolerant=tolerant
+    )
+
+
+def _finishing(
+    profile: Profile, data: Iterable, quarantine, previous, report, store=None
+) -> Iterable:
+    """data less the quarantined rows, with Record Types set against previous,
+    loaded into the Store if there is one"""
+    if quarantine is not None and previous is not None:
+        # A quarantined line would be written again as Inactive, then once
+        # more when it is merged back
+        raise ValueError("A run can't both quarantine rows and set Record Types")
+    if quarantine is not None:
+        from leadcast.quarantine import Quarantine
+
+        data = Quarantine(profile, quarantine, report).divert(data)
+    if previous is not None:
+        from leadcast.record_types import RecordTypes
+
+        data = RecordTypes(profile, previous, report).assign(data)
+    if store is not None:
+        data = store.load(data)
+    return data
+
+
+@contextmanager
+def _translated(
+    profile: Profile,
+    input_file: str,
+    workers=None,
+    report=None,
+    quarantine=None,
+    checkpoint=None,
+    incremental=None,
+    previous=None,
+    store=None,
+):
+    """DEP value lists of an export file, for the length of the block
+
+    With workers, an uncompressed export is split into byte ranges that the
+    workers parse themselves (core.translate_chunks); compressed exports can
+    only be read front to back, so they are parsed here. With a quarantine
+    file, rows that don't translate are diverted to it. A Checkpoint is
+    finished once the block has written the output. With an incremental
+    cache, only the records that changed since it was filled are translated,
+    all in this process. With a previous submission, the Record Types are
+    set against it. A Store gets the rows as they are written.
+    """
+    tolerant = quarantine is not None
+    if incremental is not None:
+        from leadcast.incremental import RowCache
+
+        with open_input(input_file) as infile, RowCache(incremental, profile) as cache:
+            records = read_records(
+                infile,
+                core.as_compiled(profile).input_columns,
+                core.OPTIONAL_INPUT_COLUMNS,
+            )
+            data = core.translate_values_cached(
+                profile, records, cache, report, tolerant
+            )
+            yield _finishing(profile, data, quarantine, previous, report, store)
+        return
+    if checkpoint is not None:
+        data = checkpoint.rows(workers, report, tolerant)
+        yield _finishing(profile, data, quarantine, previous, report, store)
+        checkpoint.finish()
+        return
+    if workers not in (None, 1) and compression(input_file) is None:
+        data = core.translate_chunks(
+            profile, input_file, workers, report=report, tolerant=tolerant
+        )
+        yield _finishing(profile, data, quarantine, previous, report, store)
+        return
+    with open_input(input_file) as infile:
+        data = translate_file(profile, infile, workers, report, tolerant)
+        yield _finishing(profile, data, quarantine, previous, report, store)
+
+
+def _writing(report, data: Iterable):
+    """data for a writer, timed as the write stage when there is a report"""
+    return nullcontext(data) if report is None else report.writing(data)
+
+
+def translate_to_csv(
+    profile,
+    input_file: str,
+    output_file: str,
+    workers=None,
+    report=None,
+    quarantine=None,
+    incremental=None,
+    previous=None,
+    store=None,
+) -> int:
+    """Translate a Leadcast export into a DEP CSV, returns the number of rows
+
+    A RunReport, if given, gets the stage timings and counters of the run.
+    With a quarantine file, rows that don't translate are set aside in it
+    (see leadcast.quarantine) rather than stopping the run. With an
+    incremental cache database, only the rows that changed since its last run
+    are translated (see leadcast.incremental). With the previous submission,
+    the Record Types say which lines are updated, added or inactive (see
+    leadcast.record_types). With a store database, the rows are loaded into
+    a new table of it as well (see leadcast.store).
+    """
+    profile = get_profile(profile)
+    if store is not None:
+        from leadcast.store import Store
+
+        store = Store(store, profile, input_file, output_file)
+    count = 0
+
+    # Open the input CSV file for reading
+    with _translated(
+        profile,
+        input_file,
+        workers,
+        report,
+        quarantine,
+        incremental=incremental,
+        previous=previous,
+        store=store,
+    ) as data:
+
+        # Open the output CSV file for writing
+        with _writing(report, data) as data, open_output(output_file) as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(profile.schema.columns)
+            for row in data:
+                # Write the modified row to the output CSV
+                writer.writerow(row)
+                count += 1
+
+    print(f"Translation complete. Data saved to {output_file}")
+    return count
+
+
+def _write_openpyxl(
+    profile: Profile, data: Iterable, input_xlsm: str, output_xlsm: str
+):
+    import openpyxl
+
+    # Open an existing Excel file or create a new one
+    try:
+        workbook = openpyxl.load_workbook(input_xlsm, keep_vba=True)
+        print(f"File '{input_xlsm}' opened successfully.")
+    except FileNotFoundError:
+        workbook = openpyxl.Workbook()
+        print(f"File '{input_xlsm}' not found, creating a new one.")
+
+    worksheet = workbook["Detailed Inventory"]
+    sheet_columns = profile.schema.sheet_columns
+    curr_row = profile.schema.first_row
+    for values in data:
+        for curr_col, val in zip(sheet_columns, values):
+            worksheet.cell(row=curr_row, column=curr_col, value=val)
+        curr_row += 1
+
+    workbook.save(output_xlsm)
+    return curr_row - profile.schema.first_row
+
+
+def translate_to_xlsm(
+    profile,
+    input_csv: str,
+    input_xlsm: str,
+    output_xlsm: str,
+    workers=None,
+    cache=None,
+    report=None,
+    quarantine=None,
+    checkpoint=None,
+    incremental=None,
+    previous=None,
+    store=None,
+) -> int:
+    """Translate a Leadcast export into a copy of the DEP workbook
+
+    The 2025 form is streamed straight into the sheet XML; 2024 forms go
+    through openpyxl as they always have. With a checkpoint file, a run that
+    is cut short carries on where it got to when started again (see
+    leadcast.checkpoint).
+
+    Args:
+        profile: A Profile or its name
+        input_csv (str): Leadcast export
+        input_xlsm (str): DEP form, never modified
+        output_xlsm (str): Workbook to write
+        workers (optional): Worker processes. Defaults to None, all in this process.
+        cache (TemplateCache, optional): Where the split 2025 form is kept.
+            Defaults to None, the default TemplateCache().
+        report (RunReport, optional): Gets the stage timings and counters of
+            the run. Defaults to None.
+        quarantine (str, optional): File to set aside rows that don't
+            translate in, see leadcast.quarantine. Defaults to None, they
+            stop the run.
+        checkpoint (str, optional): State file to save the run's progress in.
+            Defaults to None, no checkpoints.
+        incremental (str, optional): Cache database of translated rows, see
+            leadcast.incremental. Defaults to None, every row is translated.
+        previous (str, optional): Inventory submitted last, to set the Record
+            Types against, see leadcast.record_types. Defaults to None, all
+            Initial.
+        store (str, optional): SQLite database to load the rows into as
+            well, see leadcast.store. Defaults to None.
+
+    Returns:
+        int: Number of rows written
+    """
+    profile = get_profile(profile)
+    if checkpoint is not None and incremental is not None:
+        raise ValueError("A run can't be both checkpointed and incremental")
+    if checkpoint is not None:
+        from leadcast.checkpoint import Checkpoint
+
+        checkpoint = Checkpoint(checkpoint, profile, input_csv, output_xlsm)
+    if store is not None:
+        from leadcast.store import Store
+
+        store = Store(store, profile, input_csv, output_xlsm)
+
+    # Open the input CSV file for reading
+    with _translated(
+        profile,
+        input_csv,
+        workers,
+        report,
+        quarantine,
+        checkpoint,
+        incremental,
+        previous,
+        store,
+    ) as data:
+
+        if profile.form != "2025":
+            with _writing(report, data) as data:
+                return _write_openpyxl(profile, data, input_xlsm, output_xlsm)
+
+        from leadcast.template_cache import TemplateCache
+        from leadcast.xlsm import write_rows
+
+        # Rows are streamed into the "Detailed Inventory" sheet XML of a copy of
+        # the template. The split template is cached until DEP ships a new form
+        # revision
+        with _writing(report, data) as data:
+            count = write_rows(
+                data,
+                input_xlsm,
+                output_xlsm,
+                columns=profile.schema.sheet_columns,
+                first_row=profile.schema.first_row,
+                cache=cache or TemplateCache(),
+            )
+
+    print(f"Translation complete. {count} rows saved to {output_xlsm}")
+    return count
+
+
+def translate_to_arrow(
+    profile,
+    input_file: str,
+    output_file: str,
+    file_format: str = "parquet",
+    workers=None,
+    report=None,
+    quarantine=None,
+    incremental=None,
+    previous=None,
+    store=None,
+) -> int:
+    """Translate a Leadcast export into a typed Parquet or Arrow IPC file
+
+    Args:
+        profile: A Profile or its name
+        input_file (str): Leadcast export
+        output_file (str): File to write
+        file_format (str, optional): "parquet" or "arrow". Defaults to "parquet".
+        workers (optional): Worker processes. Defaults to None, all in this process.
+        report (RunReport, optional): Gets the stage timings and counters of
+            the run. Defaults to None.
+        quarantine (str, optional): File to set aside rows that don't
+            translate in, see leadcast.quarantine. Defaults to None, they
+            stop the run.
+        incremental (str, optional): Cache database of translated rows, see
+            leadcast.incremental. Defaults to None, every row is translated.
+        previous (str, optional): Inventory submitted last, to set the Record
+            Types against, see leadcast.record_types. Defaults to None, all
+            Initial.
+        store (str, optional): SQLite database to load the rows into as
+            well, see leadcast.store. Defaults to None.
+
+    Returns:
+        int: Number of rows written
+    """
+    from leadcast.arrow import write_arrow
+
+    profile = get_profile(profile)
+    if store is not None:
+        from leadcast.store import Store
+
+        store = Store(store, profile, input_file, output_file)
+    with _translated(
+        profile,
+        input_file,
+        workers,
+        report,
+        quarantine,
+        incremental=incremental,
+        previous=previous,
+        store=store,
+    ) as data:
+        with _writing(report, data) as data:
+            count = write_arrow(data, profile.schema, output_file, file_format)
+
+    print(f"Translation complete. {count} rows saved to {output_file}")
+    return count
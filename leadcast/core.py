@@ -0,0 +1,1372 @@
+"""The translation rules shared by every profile.
+
+:func:`compile_profile` turns a :class:`leadcast.profiles.Profile` into a
+:class:`Compiled` translator: every choice the profile makes (which material
+rule, which date rule, which basis rules, which comments) is resolved once,
+and the constants are bound into closures, so the per-row function only does
+the work that depends on the row.
+"""
+
+import collections
+import datetime
+import hashlib
+import os
+import string
+import time
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from leadcast.dates import parse_date
+from leadcast.lookups import decade_label
+from leadcast.parallel import SHARD_SIZE, map_ordered, shards
+from leadcast.chunks import read_chunk, split_export
+from leadcast.reader import check_columns, parse_records, resolve_columns
+from leadcast.profiles import (
+    BASIS_FROM_VERIFICATION_METHOD,
+    BASIS_NONE,
+    BASIS_UNKNOWN,
+    INSTALL_DATE_AS_IS,
+    LABEL_DUPLICATES,
+    LABEL_EVERY_ADDRESS,
+    LABEL_ID_SUFFIX,
+    NOTES_ALL,
+    NOTES_WATER_MAIN,
+    PROFILES,
+    VERIFICATION_DATE_LATEST,
+    BasisRule,
+    Profile,
+)
+
+FIELD_METHODS = (
+    "E) Visual inspection at existing access point",
+    "F) CCTV inspection inside pipe - full length",
+    "G) CCTV inspection outside pipe - at curb box",
+    "H) Mechanical excavation - 1 location",
+    "J) Mechanical excavation - 2 locations",
+    "K) Mechanical excavation - 3+ locations",
+    "L) Other - enter in Comments field",
+)
+NON_FIELD_METHODS = (
+    "A) Records review",
+    "B) Modeling/statistical analysis",
+    "C) Water sampling (no CCT)",
+    "D) Other - enter in Comments field",
+)
+RECORDS_METHODS = frozenset(
+    [
+        "Records Validation",
+        "Records Invalidation",
+        "Installation Date After Lead Ban",
+        'Diameter > 2"',
+        "Replacement Record",
+        "Records - Other",
+        "Installation Records",
+    ]
+)
+STATISTICAL_METHODS = frozenset(["Predictive Model", "Statistical Analysis"])
+
+BAN_METHOD = "Installation Date After Lead Ban"
+DIAMETER_METHOD = 'Diameter > 2"'
+RECORDS_METHOD = "Records - Other"
+UNKNOWN_MATERIALS_2024 = frozenset(
+    ["Q) Unknown - Likely Lead", "R) Unknown - Unlikely Lead", "S) Unknown"]
+)
+UNKNOWN_MATERIAL_2024 = "S) Unknown"
+LEAD_2024 = "A) Lead"
+COMMENT_MATERIALS = frozenset(["DI", "BR", "PL"])
+WATER_MAIN_NOTE = (
+    "Utility side installation date is estimated from installation date of "
+    "nearest water main"
+)
+UNKNOWN_STATUS = "Lead Status Unknown"
+DAY_CARE = frozenset(["Day Care", "Residential & In-Home Day Care"])
+# Building Types Leadcast exports use; any other is translated as Building/Other
+BUILDING_TYPES = DAY_CARE | frozenset(
+    [
+        "Single-Family",
+        "Multi-Family",
+        "Commercial",
+        "Government",
+        "Industrial",
+        "Elementary School",
+        "School Non-Elementary",
+    ]
+)
+
+# Index of the Street Address 2 column, the only one that depends on other rows
+ADDRESS_2 = {"2024": 5, "2025": 4}
+
+# Export columns each form reads, in the order its row function unpacks them.
+# Records are tuples of these values rather than dicts of the whole export row.
+INPUT_COLUMNS = {
+    "2024": (
+        "ID",
+        "PWS ID",
+        "Street",
+        "City",
+        "Zipcode",
+        "Building Type",
+        "Connector Materials",
+        "Utility Materials",
+        "Utility Installation Dates",
+        "Utility Material Method",
+        "Utility Verification Method",
+        "Utility Field Verified",
+        "Utility Verification date",
+        "Utility Diameters",
+        "Utility Previously Lead",
+        "Utility Notes",
+        "Private Materials",
+        "Private Installation Dates",
+        "Private Material Method",
+        "Private Verification Method",
+        "Private Field Verified",
+        "Private Verification Date",
+        "Private Notes",
+        "POE Filter",
+        "Plumbing Contains Lead Solder",
+        "Sample Site Status",
+    ),
+    "2025": (
+        "ID",
+        "PWS ID",
+        "Street",
+        "City",
+        "Zipcode",
+        "Building Type",
+        "Connector Materials",
+        "Water Main Install Year",
+        "Utility Materials",
+        "Utility Status",
+        "Utility Material Method",
+        "Predict Score Utility",
+        "Utility Installation Dates",
+        "Utility Diameters",
+        "Utility Previously Lead",
+        "Utility Field Verified",
+        "Utility Verification date",
+        "Utility Notes",
+        "Private Materials",
+        "Private Status",
+        "Private Material Method",
+        "Predict Score Private",
+        "Private Installation Dates",
+        "Private Diameters",
+        "Private Field Verified",
+        "Private Verification Date",
+        "Private Notes",
+        "POE Filter",
+        "Lead Solder Present",
+        "Other Fittings Containing Lead",
+        "Plumbing Material",
+        "Plumbing Contains Lead Solder",
+    ),
+}
+# The scripts read these with row.get(): an export without them is still valid
+OPTIONAL_INPUT_COLUMNS = frozenset(["PWS ID", "Utility Notes", "Private Notes"])
+# Positions shared by both forms, for the labelers and the TRAINING filter
+ID, PWS_ID, STREET = 0, 1, 2
+
+# Parts of a row, in the order the row functions build them. A timed run passes
+# row() a lap(stage) callback, called as each one is done
+STAGES = ("basic_info", "system_owned", "customer_owned", "tap_monitoring")
+# Counters every run keeps, besides the profile's predict score counters:
+# TRAINING rows left out, and rows with a non-empty material code (on either
+# side) missing from the profile's material map
+SKIPPED = "training_rows_skipped"
+UNMAPPED = "unmapped_materials"
+# Rows a tolerant run diverted to its quarantine file
+QUARANTINED = "quarantined_rows"
+
+
+def field_method(method: str) -> Optional[str]:
+    if method == "Visual Inspection":
+        return FIELD_METHODS[0]
+    return None
+
+
+def non_field_method(method: str) -> Optional[str]:
+    if method in RECORDS_METHODS:
+        return NON_FIELD_METHODS[0]
+    elif method in STATISTICAL_METHODS:
+        return NON_FIELD_METHODS[1]
+    elif method == "Other":
+        return NON_FIELD_METHODS[3]
+    return None
+
+
+def increment_label(index):
+    """Generate a label (A, B, ..., Z, AA, AB, ..., AZ, BA, ...) for duplicates."""
+    label = ""
+    while index >= 0:
+        label = string.ascii_uppercase[index % 26] + label
+        index = index // 26 - 1
+    return label
+
+
+def capitalize_address(street: str) -> str:
+    """Capitalize the first letter of each word in the street address."""
+    return street.title()
+
+
+def split_verification_dates(field_from_leadcst, output_additional_comments) -> str:
+    """DEP requires that only one date exists in their 'Date of Field Verification' field. This function will split the data coming from leadcast, keep one, and add the remaining to the 'Additional Comments' field
+
+    Args:
+        field_from_leadcst (_type_): Either 'Utility Verification date' or 'Private Verification Date'
+            Yes, 'Utility Verification date' is correct the date is lowercase. In the future this case might need to be handled if it is made uppercase
+        output_additional_comments (_type_): Either one or the other 'Additional Comments' fields in DEP output
+    """
+    return field_from_leadcst.split(" | ")[0]
+
+
+def install_date_range(date: str) -> Optional[str]:
+    """DEP installation date range of a Leadcast date, None if it doesn't parse"""
+    if not date:
+        return None
+    try:
+        return decade_label(parse_date(date).year)
+    except ValueError:
+        return None
+
+
+def latest_date(dates: str, ignored: Optional[str] = None) -> str:
+    """Most recent of several " | " separated dates, skipping ignored"""
+    return max((d for d in dates.split(" | ") if d != ignored), key=parse_date)
+
+
+def street_address_2(capitalized_address: str, address_count: dict) -> Optional[str]:
+    """Suffix for repeated street addresses: None the first time, then A, B, ..., AA
+
+    Args:
+        capitalized_address (str): STREET ADDRESS of the row
+        address_count (dict): Occurrences of each address so far, updated in place
+
+    Returns:
+        Optional[str]: STREET ADDRESS 2
+    """
+    if capitalized_address in address_count:
+        address_count[capitalized_address] += 1
+        # Generate the increment label (A, B, AA, etc.) based on the occurrence count
+        return increment_label(address_count[capitalized_address] - 2)  # Start from A
+    address_count[capitalized_address] = 1
+    return None  # First occurrence of this street, no suffix
+
+
+###################################
+## Compiling profiles
+###################################
+
+
+class Compiled(NamedTuple):
+    """A profile compiled into functions
+
+    Args:
+        profile (Profile): The profile
+        row (Callable): row(record, counters, lap=None) -> list of DEP values,
+            with Street Address 2 left empty
+        labeler (Callable): labeler(address_count=None) -> label(record), a
+            fresh Street Address 2 labeler for one run, or one carrying on from
+            the address counts of an earlier one; label() updates them in place
+        counters (Tuple[str, ...]): Names of the predict score counters row()
+            increments, besides UNMAPPED
+        input_columns (Tuple[str, ...]): Export columns of a record, in order
+    """
+
+    profile: Profile
+    row: Callable
+    labeler: Callable
+    counters: Tuple[str, ...]
+    input_columns: Tuple[str, ...]
+
+
+# Basis rule conditions: (method, date, material) -> bool, given the ban date
+CONDITIONS = {
+    "method is ban": lambda ban: lambda method, date, material: method == BAN_METHOD,
+    "method is diameter": lambda ban: lambda method, date, material: (
+        method == DIAMETER_METHOD
+    ),
+    "method is records": lambda ban: lambda method, date, material: (
+        method == RECORDS_METHOD
+    ),
+    "method has diameter": lambda ban: lambda method, date, material: (
+        DIAMETER_METHOD in method
+    ),
+    "installed after ban": lambda ban: lambda method, date, material: bool(
+        date and date >= ban
+    ),
+    "method has ban or installed after ban": lambda ban: lambda method, date, material: bool(
+        BAN_METHOD in method or (date and date >= ban)
+    ),
+    "dated, method has diameter": lambda ban: lambda method, date, material: bool(
+        date and DIAMETER_METHOD in method
+    ),
+    "method is records, material known": lambda ban: lambda method, date, material: (
+        method == RECORDS_METHOD and material not in UNKNOWN_MATERIALS_2024
+    ),
+    "material is lead": lambda ban: lambda method, date, material: material
+    == LEAD_2024,
+}
+# Conditions that look at the parsed installation date
+DATE_CONDITIONS = frozenset(
+    [
+        "installed after ban",
+        "method has ban or installed after ban",
+        "dated, method has diameter",
+    ]
+)
+
+
+def _compile_basis(profile: Profile, rules: Tuple[BasisRule, ...], default: str):
+    """basis(method, verification_method, specific, utility_specific, material)
+    -> (first, second, comment, material)"""
+    ban = datetime.date(profile.lead_ban_year or 1, 1, 1)
+    checks = []
+    for rule in rules:
+        comment = rule.comment.format(
+            utility=profile.utility,
+            ban_year=profile.lead_ban_year,
+            source=profile.records_source,
+            specific="{specific}",
+            utility_specific="{utility_specific}",
+        )
+        checks.append(
+            (
+                CONDITIONS[rule.when](ban),
+                rule.first,
+                rule.second,
+                comment,
+                "{" in comment,
+            )
+        )
+    needs_date = any(rule.when in DATE_CONDITIONS for rule in rules)
+    if default not in (BASIS_FROM_VERIFICATION_METHOD, BASIS_NONE, BASIS_UNKNOWN):
+        raise ValueError(f"Unknown basis default {default!r}")
+
+    def basis(method, verification_method, specific, utility_specific, material):
+        date = parse_date(specific) if needs_date and specific else None
+        for condition, first, second, comment, formatted in checks:
+            if condition(method, date, material):
+                if formatted:
+                    comment = comment.format(
+                        specific=specific, utility_specific=utility_specific
+                    )
+                return first, second, comment, material
+        if default == BASIS_FROM_VERIFICATION_METHOD:
+            return non_field_method(verification_method), None, None, material
+        if default == BASIS_UNKNOWN:
+            return None, None, None, UNKNOWN_MATERIAL_2024
+        return None, None, None, material
+
+    return basis
+
+
+def _compile_material(profile: Profile) -> Callable[[str], Optional[str]]:
+    lookup = profile.material_map.get
+    priority = profile.material_priority
+    if priority is None:
+        return lookup
+    fallback = lookup("UNK-NL")
+
+    def material(value: str) -> Optional[str]:
+        # Material handling (only split if "|" is found)
+        if "|" not in value:
+            return lookup(value)
+        materials = value.split(" | ")
+        for code in priority:
+            if code in materials:
+                return lookup(code) or fallback
+        # Default to UNK-NL if no match in hierarchy
+        return fallback
+
+    return material
+
+
+def _compile_install_dates(profile: Profile) -> Callable[[str], Tuple]:
+    """install(value) -> (installation date range, installation date specific)"""
+    if profile.install_dates == INSTALL_DATE_AS_IS:
+
+        def install(value: str) -> Tuple:
+            # translate.py let a date that doesn't parse stop the run
+            if not value:
+                return None, value
+            return decade_label(parse_date(value).year), value
+
+        return install
+
+    ignored = profile.ignored_install_date
+
+    def install(value: str) -> Tuple:
+        # Installation Date Handling (only split if "|" is found)
+        if "|" in value:
+            value = latest_date(value, ignored)
+        return install_date_range(value), value
+
+    return install
+
+
+def _compile_notes(scheme: Optional[str]) -> Callable[[str], Optional[str]]:
+    if scheme == NOTES_ALL:
+        return lambda notes: notes or None
+    if scheme == NOTES_WATER_MAIN:
+        return lambda notes: notes if WATER_MAIN_NOTE in notes else None
+    return lambda notes: None
+
+
+def _compile_labeler(
+    profile: Profile,
+) -> Callable[[], Callable[[tuple], Optional[str]]]:
+    scheme = profile.street_address_2
+
+    def labeler(address_count: Optional[dict] = None):
+        if address_count is None:
+            address_count = {}
+
+        if scheme == LABEL_EVERY_ADDRESS:
+
+            def label(record):
+                street = record[STREET]
+                count = address_count.get(street, -1) + 1
+                address_count[street] = count
+                return increment_label(count)
+
+        elif scheme == LABEL_ID_SUFFIX:
+
+            def label(record):
+                id_value = record[ID]
+                # Check if the ID has a suffix letter at the end
+                if id_value and id_value[-1].isalpha():
+                    return id_value[-1].upper()
+                return street_address_2(record[STREET], address_count)
+
+        elif scheme == LABEL_DUPLICATES:
+
+            def label(record):
+                return street_address_2(
+                    capitalize_address(record[STREET]), address_count
+                )
+
+        else:
+            raise ValueError(f"Unknown Street Address 2 scheme {scheme!r}")
+        return label
+
+    return labeler
+
+
+def _compile_2024(profile: Profile) -> Callable:
+    material = _compile_material(profile)
+    install = _compile_install_dates(profile)
+    utility_basis = _compile_basis(
+        profile, profile.utility_basis, profile.utility_basis_default
+    )
+    private_basis = _compile_basis(
+        profile, profile.private_basis, profile.private_basis_default
+    )
+    utility_notes = _compile_notes(profile.utility_notes)
+    private_notes = _compile_notes(profile.private_notes)
+    street_address = capitalize_address if profile.capitalize_street else str
+    latest_verification = profile.verification_dates == VERIFICATION_DATE_LATEST
+    comments = profile.comments
+    childcare_in_school = profile.childcare_in_school_column
+    lead_connector = profile.lead_connector
+
+    school = {
+        "Elementary School": "Yes - Elementary",
+        "School Non-Elementary": "Yes - Secondary",
+    }
+    previously_lead = {"Yes": "Yes", "No": "No", "Unknown": "Not sure"}
+    connected_to = {
+        "Single-Family": "S) Single family residence",
+        "Multi-Family": "M) Multi family residence",
+    }
+    yes_no = {"Yes": "Yes", "No": "No"}
+
+    def verification_date(value: str) -> str:
+        return latest_date(value) if latest_verification else value
+
+    def side_comments(basis_comment, materials, notes):
+        if not comments:
+            return None
+        parts = [basis_comment] if basis_comment else []
+        if materials in COMMENT_MATERIALS:
+            parts.append(f"Material: {materials}")
+        if notes:
+            parts.append(notes)
+        return " | ".join(parts) if parts else None
+
+    def row_2024(record: tuple, counters: dict, lap=None) -> List:
+        (
+            id_value,
+            _,
+            street,
+            city,
+            zipcode,
+            building,
+            connector,
+            utility_materials,
+            utility_installation,
+            utility_material_method,
+            utility_verification_method,
+            utility_field_verified,
+            utility_verification_dates,
+            diameter,
+            utility_previously_lead,
+            utility_notes_value,
+            private_materials,
+            private_installation,
+            private_material_method,
+            private_verification_method,
+            private_field_verified,
+            private_verification_dates,
+            private_notes_value,
+            poe_filter,
+            contains_lead_solder,
+            sample_site_status,
+        ) = record
+        childcare = "Yes" if building in DAY_CARE else "No"
+        if childcare_in_school:
+            school_value, childcare_value = childcare, None
+        else:
+            school_value, childcare_value = school.get(building, "No"), childcare
+        if not lead_connector or connector == "UNK":
+            connector_value = "Not sure"
+        else:
+            connector_value = "Yes" if connector == "LD" else "No"
+        street_value = street_address(street)
+        if lap is not None:
+            lap("basic_info")
+
+        # System-Owned Portion of Service Line
+        utility_range, utility_specific = install(utility_installation)
+        utility_material = material(utility_materials)
+        unmapped = utility_material is None and bool(utility_materials)
+        utility_first, utility_second, utility_comment, utility_material = (
+            utility_basis(
+                utility_material_method,
+                utility_verification_method,
+                utility_specific,
+                utility_specific,
+                utility_material,
+            )
+        )
+        if utility_field_verified == "Yes":
+            utility_field_method = field_method(utility_verification_method)
+            utility_verified_on = verification_date(utility_verification_dates)
+        else:
+            utility_field_method = utility_verified_on = None
+        utility_comments = side_comments(
+            utility_comment, utility_materials, utility_notes(utility_notes_value)
+        )
+        if lap is not None:
+            lap("system_owned")
+
+        # Customer-Owned Portion of Service Line
+        private_range, private_specific = install(private_installation)
+        private_material = material(private_materials)
+        if unmapped or (private_material is None and private_materials):
+            counters[UNMAPPED] += 1
+        private_first, private_second, private_comment, private_material = (
+            private_basis(
+                private_material_method,
+                private_verification_method,
+                private_specific,
+                utility_specific,
+                private_material,
+            )
+        )
+        private_verified_on = (
+            verification_date(private_verification_dates)
+            if private_field_verified == "Yes"
+            else None
+        )
+        private_comments = side_comments(
+            private_comment, private_materials, private_notes(private_notes_value)
+        )
+        if lap is not None:
+            lap("customer_owned")
+
+        values = [
+            id_value,
+            "Initial",
+            None,
+            "Joint",
+            street_value,
+            None,
+            city,
+            zipcode,
+            school_value,
+            childcare_value,
+            utility_material,
+            previously_lead.get(utility_previously_lead),
+            connector_value,
+            utility_range,
+            utility_specific,
+            diameter if diameter != "99" else None,
+            utility_first,
+            utility_second,
+            utility_field_method,
+            utility_verified_on,
+            utility_comments,
+            private_material,
+            connector_value,
+            private_range,
+            private_specific,
+            private_first,
+            private_second,
+            field_method(private_verification_method),
+            private_verified_on,
+            private_comments,
+            connected_to.get(building, "O) Building/Other"),
+            yes_no.get(poe_filter, "Not sure"),
+            yes_no.get(contains_lead_solder, "Not sure"),
+            "Yes" if sample_site_status == "Yes" else "No",
+        ]
+        if lap is not None:
+            lap("tap_monitoring")
+        return values
+
+    return row_2024
+
+
+def _compile_2025(profile: Profile) -> Callable:
+    material = _compile_material(profile)
+    utility_notes = _compile_notes(profile.utility_notes)
+    private_notes = _compile_notes(profile.private_notes)
+    change_from_predict_score = profile.change_from_predict_score
+    threshold = profile.predict_score_threshold
+    water_main_ban_year = profile.water_main_lead_ban_year
+    unknown_not_lead = material("UNK-NL")
+
+    school = {
+        "Elementary School": "YES - ELEMENTARY",
+        "School Non-Elementary": "YES - SECONDARY",
+    }
+    previously_lead = {"Yes": "YES", "No": "NO"}
+    connected_to = {
+        "Single-Family": "S) SINGLE FAMILY RESIDENCE",
+        "Multi-Family": "M) MULTI FAMILY RESIDENCE",
+    }
+    poe_treatment = {"Yes": "YES", "No": "NO"}
+
+    def side(side_material, status, method, predict_score, main_year):
+        """(material, status, verification methods, comments) of one side
+
+        Verification method priority:
+        1. Field verification [Visual Inspection, CCTV, Mechanical Excavation]
+        2. Diameter > 2"
+        3. Installation Date After Lead Ban
+        4. Stats/Modeling [B) MODELING/STATISTICAL ANALYSIS]
+        5. Records Review
+        """
+        low_score = bool(predict_score) and float(predict_score) <= threshold
+        changed = False
+        if change_from_predict_score and low_score and status == UNKNOWN_STATUS:
+            # Update Material based on Predict Score
+            status, side_material, changed = "Non-Lead", unknown_not_lead, True
+        methods, comments = [], []
+        if status != UNKNOWN_STATUS:
+            if "Field Inspection" in method:
+                methods.append("E) VISUAL INSPECTION AT 1 ACCESS POINT")
+            if DIAMETER_METHOD in method:
+                methods.append("D) OTHER - ENTER IN COMMENTS FIELD")
+                comments.append("Diameter greater than 2 inches")
+            if BAN_METHOD in method:
+                methods.append("A) RECORDS REVIEW")
+                comments.append("Installation date after lead ban")
+            # Read only for a side whose status is known, as the scripts did
+            if main_year and int(main_year) >= water_main_ban_year:
+                methods.append("O) HIGH CONFIDENCE IN RECORDS")
+                comments.append("Water main installed after lead ban")
+            if low_score:
+                methods.append("B) MODELING/STATISTICAL ANALYSIS")
+                comments.append("Predictive model indicates low likelihood of lead")
+            if RECORDS_METHOD in method or "Installation Records" in method:
+                methods.append("A) RECORDS REVIEW")
+                comments.append("Records review indicates non-lead material")
+        methods += [None, None]
+        return side_material, changed, methods, comments
+
+    def finish_comments(comments, materials, notes, changed):
+        # A predict score change turns the materials into UNK-NL
+        if not changed and materials in COMMENT_MATERIALS:
+            comments.append(f"Material: {materials}")
+        if notes:
+            comments.append(notes)
+        return " | ".join(comments) if comments else None
+
+    def installed(value):
+        if value:
+            # Not used, but a date that doesn't parse stops the run
+            parse_date(value)
+        return install_date_range(value)
+
+    def verification_date(verified, value):
+        if verified == "Yes" and value:
+            return latest_date(value)
+        return None
+
+    def interior_plumbing(solder_present, fittings, plumbing, contains_solder):
+        if (
+            solder_present == "Unknown"
+            and fittings == "Unknown"
+            and plumbing == "Unknown"
+            and contains_solder == "Unknown"
+        ):
+            return "NOT SURE"
+        if plumbing == "LD":
+            return "IS LEAD"
+        if plumbing == "GALV":
+            return "IS GALVANIZED"
+        if solder_present == "Yes":
+            return "CONTAINS LEAD SOLDER"
+        if solder_present == "No" and fittings == "No" and contains_solder == "No":
+            return "NO LEAD OR GALVANIZED PRESENT"
+        return "UNKNOWN"
+
+    def row_2025(record: tuple, counters: dict, lap=None) -> List:
+        (
+            id_value,
+            _,
+            street,
+            city,
+            zipcode,
+            building,
+            connector,
+            main_year,
+            utility_materials,
+            utility_status,
+            utility_material_method,
+            utility_predict_score,
+            utility_installation,
+            utility_diameter,
+            utility_previously_lead,
+            utility_field_verified,
+            utility_verification_dates,
+            utility_notes_value,
+            private_materials,
+            private_status,
+            private_material_method,
+            private_predict_score,
+            private_installation,
+            private_diameter,
+            private_field_verified,
+            private_verification_dates,
+            private_notes_value,
+            poe_filter,
+            solder_present,
+            fittings,
+            plumbing,
+            contains_solder,
+        ) = record
+        connector_value = (
+            "YES" if connector == "LD" else "NOT SURE" if connector == "UNK" else "NO"
+        )
+        street_value = capitalize_address(street)
+        if lap is not None:
+            lap("basic_info")
+
+        # System-Owned Portion of Service Line
+        utility_material = material(utility_materials)
+        unmapped = utility_material is None and bool(utility_materials)
+        utility_material, utility_changed, utility_methods, utility_comments = side(
+            utility_material,
+            utility_status,
+            utility_material_method,
+            utility_predict_score,
+            main_year,
+        )
+        counters["utility"] += utility_changed
+        utility_range = installed(utility_installation)
+        utility_verified_on = verification_date(
+            utility_field_verified, utility_verification_dates
+        )
+        utility_comments = finish_comments(
+            utility_comments,
+            utility_materials,
+            utility_notes(utility_notes_value),
+            utility_changed,
+        )
+        if lap is not None:
+            lap("system_owned")
+
+        # Customer-Owned Portion of Service Line
+        private_material = material(private_materials)
+        if unmapped or (private_material is None and private_materials):
+            counters[UNMAPPED] += 1
+        private_material, private_changed, private_methods, private_comments = side(
+            private_material,
+            private_status,
+            private_material_method,
+            private_predict_score,
+            main_year,
+        )
+        counters["private"] += private_changed
+        private_range = installed(private_installation)
+        private_verified_on = verification_date(
+            private_field_verified, private_verification_dates
+        )
+        private_comments = finish_comments(
+            private_comments,
+            private_materials,
+            private_notes(private_notes_value),
+            private_changed,
+        )
+        if lap is not None:
+            lap("customer_owned")
+
+        values = [
+            id_value,
+            None,
+            "YES",
+            street_value,
+            None,
+            city,
+            zipcode,
+            school.get(building, "NO"),
+            "YES" if building in DAY_CARE else "NO",
+            ###
+            utility_material,
+            previously_lead.get(utility_previously_lead, "NOT SURE"),
+            connector_value,
+            utility_range,
+            utility_installation,
+            utility_diameter if utility_diameter != "99" else None,
+            utility_methods[0],
+            utility_methods[1],
+            utility_verified_on,
+            utility_comments,
+            ###
+            private_material,
+            connector_value,
+            private_range,
+            private_installation,
+            private_diameter if private_diameter != "99" else None,
+            private_methods[0],
+            private_methods[1],
+            private_verified_on,
+            private_comments,
+            ###
+            connected_to.get(building, "O) BUILDING/OTHER"),
+            poe_treatment.get(poe_filter, "NOT SURE"),
+            interior_plumbing(solder_present, fittings, plumbing, contains_solder),
+            None,
+            ###
+            None,
+        ]
+        if lap is not None:
+            lap("tap_monitoring")
+        return values
+
+    return row_2025
+
+
+_FORMS = {"2024": (_compile_2024, ()), "2025": (_compile_2025, ("utility", "private"))}
+
+
+def compile_profile(profile: Profile) -> Compiled:
+    """Compile a profile into its row function and Street Address 2 labeler"""
+    compile_rows, counters = _FORMS[profile.form]
+    return Compiled(
+        profile,
+        compile_rows(profile),
+        _compile_labeler(profile),
+        counters,
+        INPUT_COLUMNS[profile.form],
+    )
+
+
+@lru_cache(maxsize=None)
+def compiled(name: str) -> Compiled:
+    """The compiled profile of that name, compiled on first use"""
+    return compile_profile(PROFILES[name])
+
+
+def as_compiled(profile) -> Compiled:
+    """Compiled form of a Profile, a profile name or an already Compiled profile"""
+    if isinstance(profile, Compiled):
+        return profile
+    if isinstance(profile, str):
+        return compiled(profile)
+    if PROFILES.get(profile.name) is profile:
+        return compiled(profile.name)
+    return compile_profile(profile)
+
+
+def _output(compiled_profile: Compiled, rows: Iterable[List]) -> Iterator:
+    columns = compiled_profile.profile.columns
+    if compiled_profile.profile.as_dict:
+        return (dict(zip(columns, values)) for values in rows)
+    return iter(rows)
+
+
+def _new_counters(compiled_profile: Compiled) -> dict:
+    return dict.fromkeys(compiled_profile.counters + (SKIPPED, UNMAPPED), 0)
+
+
+def _skip_training(records: Iterable[tuple], counters: dict) -> Iterator[tuple]:
+    skipped = 0
+    for record in records:
+        if record[PWS_ID] == "TRAINING":
+            skipped += 1
+        else:
+            yield record
+    counters[SKIPPED] += skipped
+
+
+class Quarantined(list):
+    """Stands in for the values of a record its row function raised on
+
+    Empty values, so Street Address 2 is labelled as for any row, plus the
+    record and the error for the quarantine to divert.
+    """
+
+    def __init__(self, width: int, record: tuple, error: str):
+        super().__init__([None] * width)
+        self.record = record
+        self.error = error
+
+
+def _tolerant(row: Callable, width: int) -> Callable:
+    """row, returning a Quarantined row where it would raise
+
+    The counters row() had already incremented for a Quarantined row are put
+    back, since the row isn't written.
+    """
+
+    def tolerant_row(record: tuple, counters: dict, lap=None) -> List:
+        before = list(counters.values())
+        try:
+            return row(record, counters, lap)
+        except Exception as error:  # Diverted, the rest of the export goes on
+            counters.update(zip(counters, before))
+            return Quarantined(width, record, f"{type(error).__name__}: {error}")
+
+    return tolerant_row
+
+
+def _row_function(compiled_profile: Compiled, tolerant: bool) -> Callable:
+    if tolerant:
+        return _tolerant(compiled_profile.row, len(compiled_profile.profile.columns))
+    return compiled_profile.row
+
+
+def _timed(row: Callable, seconds: dict) -> Callable:
+    """row, adding the wall time of each of its STAGES to seconds[stage]"""
+    clock = time.perf_counter
+    last = [0.0]
+
+    def lap(stage: str):
+        now = clock()
+        seconds[stage] += now - last[0]
+        last[0] = now
+
+    def timed_row(record: tuple, counters: dict) -> List:
+        last[0] = clock()
+        return row(record, counters, lap)
+
+    return timed_row
+
+
+def _timed_label(label: Callable, seconds: dict) -> Callable:
+    """label, adding its wall time to the basic_info stage it belongs to"""
+    clock = time.perf_counter
+
+    def timed_label(record: tuple) -> Optional[str]:
+        start = clock()
+        value = label(record)
+        seconds["basic_info"] += clock() - start
+        return value
+
+    return timed_label
+
+
+def _finish(compiled_profile: Compiled, counters: dict, report):
+    _report(compiled_profile, counters)
+    if report is not None:
+        report.count(counters, compiled_profile.counters)
+
+
+def _report(compiled_profile: Compiled, counters: dict):
+    for name in compiled_profile.counters:
+        print(f"{name} predict changes:", counters[name])
+
+
+def records_from_dicts(profile, input_data: Iterable[dict]) -> Iterator[tuple]:
+    """Records of the profile's input columns from csv.DictReader style rows
+
+    Raises:
+        MissingColumnsError: The first row lacks a required column
+    """
+    columns = as_compiled(profile).input_columns
+    input_data = iter(input_data)
+    first = next(input_data, None)
+    if first is None:
+        return
+    check_columns(first, columns, OPTIONAL_INPUT_COLUMNS)
+    if all(column in first for column in columns):
+        record = itemgetter(*columns)
+    else:
+
+        def record(row):
+            return tuple([row.get(column, "") for column in columns])
+
+    yield record(first)
+    yield from map(record, input_data)
+
+
+def translate_values(
+    profile, records: Iterable[tuple], report=None, tolerant=False
+) -> Iterator[List]:
+    """Translate records into lists of DEP values, in the profile's column order
+
+    Args:
+        profile: A Profile, its name, or a Compiled profile
+        records (Iterable[tuple]): Export rows projected to the profile's
+            input_columns, as read_records() or records_from_dicts() yield them
+        report (RunReport, optional): Times the read and row stages and takes
+            the counters. Defaults to None, untimed.
+        tolerant (bool, optional): Yield a Quarantined row for a record the
+            row function raises on, instead of raising. Defaults to False.
+
+    Yields:
+        Iterator[List]: One list of values per DEP row
+    """
+    compiled_profile = as_compiled(profile)
+    row_values = _row_function(compiled_profile, tolerant)
+    label = compiled_profile.labeler()
+    address_2 = ADDRESS_2[compiled_profile.profile.form]
+    counters = _new_counters(compiled_profile)
+    if report is not None:
+        records = report.read(records)
+        row_values = _timed(row_values, report.seconds)
+        label = _timed_label(label, report.seconds)
+
+    if compiled_profile.profile.skip_training:
+        records = _skip_training(records, counters)
+    for record in records:
+        values = row_values(record, counters)
+        values[address_2] = label(record)
+        yield values
+    _finish(compiled_profile, counters, report)
+
+
+def translate_record(profile, record: tuple) -> List:
+    """DEP values of one record on its own
+
+    Street Address 2 is labelled as if the record were the only one in its
+    export, and TRAINING records are translated like any other.
+    """
+    compiled_profile = as_compiled(profile)
+    values = compiled_profile.row(record, _new_counters(compiled_profile))
+    address_2 = ADDRESS_2[compiled_profile.profile.form]
+    values[address_2] = compiled_profile.labeler()(record)
+    return values
+
+
+def record_digest(record: tuple) -> bytes:
+    """16-byte digest of a record's values, to tell whether it has changed"""
+    return hashlib.blake2b("\x1f".join(record).encode("utf-8"), digest_size=16).digest()
+
+
+def translate_values_cached(
+    profile,
+    records: Iterable[tuple],
+    cache,
+    report=None,
+    tolerant=False,
+    shard_size=SHARD_SIZE,
+) -> Iterator[List]:
+    """Same output as translate_values, reusing the rows of unchanged records
+
+    Records are looked up in the cache a shard at a time by ID. A record whose
+    digest matches the cached one gets the cached row and counter increments;
+    the others are translated and stored. Street Address 2 is labelled here
+    for every row, in order, so it comes out as in a full run.
+
+    Args:
+        cache: lookup(ids) -> {id: (digest, values, counter increments)}, and
+            store([(id, digest, values, counter increments)]); values without
+            Street Address 2. See leadcast.incremental.RowCache.
+    """
+    compiled_profile = as_compiled(profile)
+    row_values = _row_function(compiled_profile, tolerant)
+    label = compiled_profile.labeler()
+    address_2 = ADDRESS_2[compiled_profile.profile.form]
+    counters = _new_counters(compiled_profile)
+    if report is not None:
+        records = report.read(records)
+        row_values = _timed(row_values, report.seconds)
+        label = _timed_label(label, report.seconds)
+
+    if compiled_profile.profile.skip_training:
+        records = _skip_training(records, counters)
+    for shard in shards(records, shard_size):
+        cached = cache.lookup([record[ID] for record in shard])
+        changed = []
+        for record in shard:
+            digest = record_digest(record)
+            hit = cached.get(record[ID])
+            if hit is not None and hit[0] == digest:
+                values = hit[1]
+                for counter, increment in hit[2].items():
+                    counters[counter] += increment
+            else:
+                before = list(counters.values())
+                values = row_values(record, counters)
+                if values.__class__ is not Quarantined:
+                    increments = {
+                        counter: counters[counter] - count
+                        for counter, count in zip(counters, before)
+                        if counters[counter] != count
+                    }
+                    changed.append((record[ID], digest, list(values), increments))
+            values[address_2] = label(record)
+            yield values
+        cache.store(changed)
+    _finish(compiled_profile, counters, report)
+
+
+def _translate_shard(shard):
+    """Worker side of translate_values_parallel: translate one shard of records.
+
+    Street Address 2 is assigned by the parent.
+    """
+    name, records, timed, tolerant = shard
+    compiled_profile = compiled(name)
+    row_values = _row_function(compiled_profile, tolerant)
+    counters = _new_counters(compiled_profile)
+    seconds = dict.fromkeys(STAGES, 0.0) if timed else None
+    if timed:
+        row_values = _timed(row_values, seconds)
+    out = []
+    for record in records:
+        out.append(row_values(record, counters))
+    return out, counters, seconds
+
+
+def translate_values_parallel(
+    profile,
+    records: Iterable[tuple],
+    workers=None,
+    shard_size=SHARD_SIZE,
+    report=None,
+    tolerant=False,
+) -> Iterator[List]:
+    """Same output as translate_values, with the rows translated in worker processes
+
+    Street Address 2 is assigned here as the shards are sent, and shards come back
+    in input order, so the labels match the serial run exactly. Only profiles
+    registered in PROFILES can be sent to workers. A report gets the row stages
+    summed over the workers.
+    """
+    compiled_profile = as_compiled(profile)
+    name = compiled_profile.profile.name
+    if PROFILES.get(name) is not compiled_profile.profile:
+        raise ValueError(f"Profile {name!r} is not registered in PROFILES")
+    label = compiled_profile.labeler()
+    address_2 = ADDRESS_2[compiled_profile.profile.form]
+    counters = _new_counters(compiled_profile)
+    timed = report is not None
+    if timed:
+        records = report.read(records)
+        label = _timed_label(label, report.seconds)
+
+    if compiled_profile.profile.skip_training:
+        records = _skip_training(records, counters)
+    labels = collections.deque()
+
+    def packed():
+        for shard in shards(records, shard_size):
+            labels.append([label(record) for record in shard])
+            yield name, shard, timed, tolerant
+
+    for shard_values, shard_counters, shard_seconds in map_ordered(
+        _translate_shard, packed(), workers
+    ):
+        for row_values, row_label in zip(shard_values, labels.popleft()):
+            row_values[address_2] = row_label
+            yield row_values
+        for counter in counters:
+            counters[counter] += shard_counters[counter]
+        if timed:
+            for stage in STAGES:
+                report.seconds[stage] += shard_seconds[stage]
+    _finish(compiled_profile, counters, report)
+
+
+class Progress(NamedTuple):
+    """How far translate_chunks has got, to carry on from after a restart
+
+    Args:
+        offset (int): Byte offset in the export of the next unread record
+        rows (int): Rows yielded before it
+        counters (dict): The run's counters so far
+        address_count (dict): The Street Address 2 labeler's address counts
+    """
+
+    offset: int
+    rows: int
+    counters: dict
+    address_count: dict
+
+
+def _translate_chunk(chunk):
+    """Worker side of translate_chunks: parse and translate one byte range.
+
+    Returns the rows, the first three fields of each record for the parent's
+    Street Address 2 labels, the counters, the row stage seconds (None
+    untimed) and the parse time.
+    """
+    name, path, start, end, indices, width, timed, tolerant = chunk
+    compiled_profile = compiled(name)
+    clock = time.perf_counter
+    began = clock()
+    records = list(parse_records(read_chunk(path, start, end), indices, width))
+    read_seconds = clock() - began
+    seen = len(records)
+    skipped = 0
+    if compiled_profile.profile.skip_training:
+        records = [record for record in records if record[PWS_ID] != "TRAINING"]
+        skipped = seen - len(records)
+    out, counters, seconds = _translate_shard((name, records, timed, tolerant))
+    counters[SKIPPED] += skipped
+    # Labelers only read ID and STREET, which lead every form's input columns
+    keys = [record[: STREET + 1] for record in records]
+    return out, keys, counters, seconds, read_seconds, seen
+
+
+def translate_chunks(
+    profile,
+    path: str,
+    workers=None,
+    chunk_bytes=None,
+    report=None,
+    tolerant=False,
+    resume: Optional[Progress] = None,
+    progress: Optional[Callable[[Progress], None]] = None,
+) -> Iterator[List]:
+    """Same output as translate_values of the export at path, parsed in workers too
+
+    The uncompressed export is split at record boundaries into byte ranges
+    (see leadcast.chunks) and each worker reads, parses and translates its own
+    ranges, so neither the raw bytes nor the records are sent between
+    processes. Ranges come back in file order and Street Address 2 is labelled
+    here, so the labels match the serial run exactly. Only profiles registered
+    in PROFILES can be sent to workers; workers=None or 1 translates the ranges
+    in this process.
+
+    progress, if given, is called with the Progress after the last row of
+    every range has been taken. Passing one back as resume starts from there,
+    with the same counters and Street Address 2 labels.
+
+    Raises:
+        MissingColumnsError: The export lacks a required column
+    """
+    compiled_profile = as_compiled(profile)
+    name = compiled_profile.profile.name
+    if PROFILES.get(name) is not compiled_profile.profile:
+        raise ValueError(f"Profile {name!r} is not registered in PROFILES")
+    header, ranges = split_export(
+        path, chunk_bytes, workers or 1, resume.offset if resume else None
+    )
+    indices, width = resolve_columns(
+        header, compiled_profile.input_columns, OPTIONAL_INPUT_COLUMNS
+    )
+    return _translate_ranges(
+        compiled_profile,
+        path,
+        ranges,
+        (indices, width, report is not None, tolerant),
+        workers,
+        report,
+        resume,
+        progress,
+    )
+
+
+def _translate_ranges(
+    compiled_profile, path, ranges, options, workers, report, resume, progress
+):
+    name = compiled_profile.profile.name
+    if resume is None:
+        rows, counters, address_count = 0, _new_counters(compiled_profile), {}
+    else:
+        rows, address_count = resume.rows, dict(resume.address_count)
+        counters = {**_new_counters(compiled_profile), **resume.counters}
+    label = compiled_profile.labeler(address_count)
+    address_2 = ADDRESS_2[compiled_profile.profile.form]
+    timed = report is not None
+    if timed:
+        label = _timed_label(label, report.seconds)
+    chunks = ((name, path, start, end) + options for start, end in ranges)
+    if workers is None or workers == 1:
+        results = map(_translate_chunk, chunks)
+    else:
+        results = map_ordered(_translate_chunk, chunks, workers)
+    for (_, end), (out, keys, chunk_counters, seconds, read_seconds, seen) in zip(
+        ranges, results
+    ):
+        for row_values, key in zip(out, keys):
+            row_values[address_2] = label(key)
+            yield row_values
+        rows += len(out)
+        for counter in counters:
+            counters[counter] += chunk_counters[counter]
+        if timed:
+            for stage in STAGES:
+                report.seconds[stage] += seconds[stage]
+            report.seconds["read"] += read_seconds
+            report.rows_seen += seen
+        if progress is not None:
+            progress(Progress(end, rows, dict(counters), address_count))
+    _finish(compiled_profile, counters, report)
+
+
+def translate_records(
+    profile,
+    records: Iterable[tuple],
+    workers=None,
+    shard_size=SHARD_SIZE,
+    report=None,
+    tolerant=False,
+) -> Iterator[List]:
+    """DEP value lists of records, laid out by the profile's schema
+
+    workers=None or 1 keeps everything in this process. A RunReport, if given,
+    is filled in as the rows are consumed. tolerant yields Quarantined rows
+    for records that don't translate.
+    """
+    compiled_profile = as_compiled(profile)
+    if workers is None or workers == 1:
+        return translate_values(compiled_profile, records, report, tolerant)
+    return translate_values_parallel(
+        compiled_profile, records, workers, shard_size, report, tolerant
+    )
+
+
+def translate_iter(profile, input_data: Iterable[dict]) -> Iterator:
+    """Translate Leadcast rows one at a time, yielding each DEP row as it is built."""
+    compiled_profile = as_compiled(profile)
+    return _output(
+        compiled_profile,
+        translate_records(
+            compiled_profile, records_from_dicts(compiled_profile, input_data)
+        ),
+    )
+
+
+def translate_iter_parallel(
+    profile, input_data: Iterable[dict], workers=None, shard_size=SHARD_SIZE
+) -> Iterator:
+    """Same output as translate_iter, with the rows translated in worker processes"""
+    compiled_profile = as_compiled(profile)
+    return _output(
+        compiled_profile,
+        translate_records(
+            compiled_profile,
+            records_from_dicts(compiled_profile, input_data),
+            workers or os.cpu_count() or 1,
+            shard_size,
+        ),
+    )
@@ -0,0 +1,48 @@
+"""Memoized parser for the "%m/%d/%Y" dates in Leadcast exports.
+
+Exports repeat the same handful of install and verification dates thousands
+of times, and the translate loop parses each of them more than once per row.
+``parse_date()`` splits the string by hand on the common path and remembers
+recent results, falling back to ``strptime`` for anything unusual so invalid
+values raise exactly the ``ValueError`` they always have.
+"""
+
+import datetime
+import functools
+
+LEADCAST_DATE_FORMAT = "%m/%d/%Y"
+
+# Large enough to hold every calendar day from 1880 to 2030
+DATE_CACHE_SIZE = 1 << 16
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(value: str) -> datetime.date:
+    """Parse a Leadcast "%m/%d/%Y" date
+
+    Args:
+        value (str): Date string from the export, e.g. "7/4/1991"
+
+    Raises:
+        ValueError: If the value is not a valid "%m/%d/%Y" date
+
+    Returns:
+        datetime.date: Parsed date
+    """
+    parts = value.split("/") if isinstance(value, str) else ()
+    if len(parts) == 3:
+        month, day, year = parts
+        digits = month + day + year
+        if (
+            0 < len(month) <= 2
+            and 0 < len(day) <= 2
+            and len(year) == 4
+            and digits.isascii()
+            and digits.isdigit()
+        ):
+            try:
+                return datetime.date(int(year), int(month), int(day))
+            except ValueError:
+                # Let strptime produce its usual error message
+                pass
+    return datetime.datetime.strptime(value, LEADCAST_DATE_FORMAT).date()
@@ -0,0 +1,260 @@
+"""Differences between two translated inventories, line by line.
+
+Compares a previous DEP submission with a new translation, keyed on the
+unique service line ID (the first column of every form), and lists the lines
+added, removed and changed, with the old and new value of every column that
+changed. Either side may be a translated CSV (compressed or not) or the
+Detailed Inventory sheet of a workbook.
+
+Two ways to join the sides:
+
+* hashed (the default): the previous inventory is indexed as ID -> 16-byte
+  digest of its row, the new one streamed against the index, and the
+  previous one streamed again for the old values of the lines that changed.
+  Memory is the index plus the changed lines, never whole rows.
+* presorted: both sides are already sorted by ID (as text) and are merged in
+  one pass in constant memory. A side found out of order raises ValueError.
+
+Columns are matched by name; columns only one side has are left out.
+"""
+
+import collections
+import csv
+import datetime
+import hashlib
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from leadcast.profiles import Profile, field_names
+from leadcast.streams import open_input, open_output
+
+ADDED, REMOVED, CHANGED = "added", "removed", "changed"
+REPORT_COLUMNS = ("id", "change", "column", "old", "new")
+
+
+class LineDiff(NamedTuple):
+    """One line that differs, and for a changed one (column, old, new) deltas"""
+
+    change: str
+    id: str
+    deltas: Tuple[Tuple[str, str, str], ...] = ()
+
+
+class Inventory(NamedTuple):
+    """A translated inventory: its column names and a fresh stream of its rows
+
+    Every row is a list of strings, the ID first; None and "" are both "".
+    """
+
+    columns: List[str]
+    rows: Callable[[], Iterator[List[str]]]
+
+
+def _cell_text(value) -> str:
+    # Excel may have turned the strings of a resaved submission into numbers
+    # and dates
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        return f"{value.month}/{value.day}/{value.year}"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _csv_inventory(path: str) -> Inventory:
+    with open_input(path, newline="") as infile:
+        header = next(csv.reader(infile), [])
+
+    def rows() -> Iterator[List[str]]:
+        with open_input(path, newline="") as infile:
+            reader = csv.reader(infile)
+            next(reader, None)
+            for row in reader:
+                if row and row[0]:
+                    yield row
+
+    return Inventory(field_names(header), rows)
+
+
+def _xlsm_inventory(path: str, profile: Profile) -> Inventory:
+    from leadcast.xlsm import SHEET_NAME
+
+    schema = profile.schema
+    pick = itemgetter(*[column - 1 for column in schema.sheet_columns])
+    last = max(schema.sheet_columns)
+
+    def rows() -> Iterator[List[str]]:
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            cells = workbook[SHEET_NAME].iter_rows(
+                min_row=schema.first_row, max_col=last, values_only=True
+            )
+            for row in cells:
+                row = tuple(row) + (None,) * (last - len(row))
+                values = [_cell_text(value) for value in pick(row)]
+                if values[0]:
+                    yield values
+        finally:
+            workbook.close()
+
+    return Inventory(field_names(schema.columns), rows)
+
+
+def open_inventory(path: str, profile: Optional[Profile] = None) -> Inventory:
+    """A translated CSV, or the Detailed Inventory sheet of a workbook
+
+    Raises:
+        ValueError: A workbook without the profile whose form it is
+    """
+    if path.lower().endswith((".xlsm", ".xlsx")):
+        if profile is None:
+            raise ValueError(f"{path}: reading a workbook needs its profile")
+        return _xlsm_inventory(path, profile)
+    return _csv_inventory(path)
+
+
+def _digest(values: Iterable[str]) -> bytes:
+    return hashlib.blake2b("\x1f".join(values).encode("utf-8"), digest_size=16).digest()
+
+
+def _aligned(old: Inventory, new: Inventory):
+    """Pickers of the columns both sides have, in the new side's order"""
+    positions = {name: index for index, name in enumerate(old.columns)}
+    columns = [name for name in new.columns[1:] if name in positions]
+    new_positions = {name: index for index, name in enumerate(new.columns)}
+
+    def picker(indices):
+        if not indices:
+            return lambda row: ()
+        get = itemgetter(*indices)
+        if len(indices) == 1:
+            return lambda row: (get(row),)
+        return get
+
+    old_pick = picker([positions[name] for name in columns])
+    new_pick = picker([new_positions[name] for name in columns])
+    width = max(len(old.columns), len(new.columns))
+
+    def padded(pick):
+        def values(row: List[str]) -> tuple:
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            return pick(row)
+
+        return values
+
+    return padded(old_pick), padded(new_pick), columns
+
+
+def _deltas(columns, old_values, new_values) -> Tuple[Tuple[str, str, str], ...]:
+    return tuple(
+        (column, old, new)
+        for column, old, new in zip(columns, old_values, new_values)
+        if old != new
+    )
+
+
+def diff_hashed(old: Inventory, new: Inventory) -> Iterator[LineDiff]:
+    """Lines added (in new's order), then changed and removed (in old's order)"""
+    old_values, new_values, columns = _aligned(old, new)
+    index = {}
+    for row in old.rows():
+        index[row[0]] = _digest(old_values(row))
+
+    changed = {}
+    for row in new.rows():
+        digest = index.pop(row[0], None)
+        if digest is None:
+            yield LineDiff(ADDED, row[0])
+            continue
+        values = new_values(row)
+        if digest != _digest(values):
+            changed[row[0]] = values
+
+    # What is left of the index was not in the new inventory
+    removed = index
+    if not changed and not removed:
+        return
+    for row in old.rows():
+        line_id = row[0]
+        if line_id in changed:
+            deltas = _deltas(columns, old_values(row), changed.pop(line_id))
+            yield LineDiff(CHANGED, line_id, deltas)
+        elif removed.pop(line_id, None) is not None:
+            yield LineDiff(REMOVED, line_id)
+
+
+def _ascending(rows: Iterator[List[str]], side: str) -> Iterator[List[str]]:
+    previous = None
+    for row in rows:
+        if previous is not None and row[0] <= previous:
+            raise ValueError(
+                f"The {side} inventory is not sorted by ID: {row[0]!r} "
+                f"comes after {previous!r}"
+            )
+        previous = row[0]
+        yield row
+
+
+def diff_sorted(old: Inventory, new: Inventory) -> Iterator[LineDiff]:
+    """Lines that differ, in ID order, merging two inventories sorted by ID"""
+    old_values, new_values, columns = _aligned(old, new)
+    old_rows = _ascending(old.rows(), "previous")
+    new_rows = _ascending(new.rows(), "new")
+    old_row, new_row = next(old_rows, None), next(new_rows, None)
+    while old_row is not None or new_row is not None:
+        if new_row is None or (old_row is not None and old_row[0] < new_row[0]):
+            yield LineDiff(REMOVED, old_row[0])
+            old_row = next(old_rows, None)
+        elif old_row is None or new_row[0] < old_row[0]:
+            yield LineDiff(ADDED, new_row[0])
+            new_row = next(new_rows, None)
+        else:
+            deltas = _deltas(columns, old_values(old_row), new_values(new_row))
+            if deltas:
+                yield LineDiff(CHANGED, new_row[0], deltas)
+            old_row, new_row = next(old_rows, None), next(new_rows, None)
+
+
+def diff_inventories(
+    old_path: str,
+    new_path: str,
+    profile: Optional[Profile] = None,
+    presorted: bool = False,
+) -> Iterator[LineDiff]:
+    """Lines that differ between a previous and a new translated inventory
+
+    Args:
+        old_path (str): Previous inventory, CSV or workbook
+        new_path (str): New inventory, CSV or workbook
+        profile (Optional[Profile], optional): Profile of the workbooks' form.
+            Defaults to None, for two CSVs.
+        presorted (bool, optional): Both are sorted by ID, merge them.
+            Defaults to False, hash join.
+    """
+    old = open_inventory(old_path, profile)
+    new = open_inventory(new_path, profile)
+    return diff_sorted(old, new) if presorted else diff_hashed(old, new)
+
+
+def write_report(diffs: Iterable[LineDiff], path: str) -> collections.Counter:
+    """Save diffs as CSV, one line per changed column; returns the counts
+
+    The counts are of added, removed and changed lines, and of the changes
+    to each column.
+    """
+    counts = collections.Counter()
+    with open_output(path) as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(REPORT_COLUMNS)
+        for diff in diffs:
+            counts[diff.change] += 1
+            if not diff.deltas:
+                writer.writerow((diff.id, diff.change, "", "", ""))
+            for column, old, new in diff.deltas:
+                counts[column] += 1
+                writer.writerow((diff.id, diff.change, column, old, new))
+    return counts
@@ -0,0 +1,184 @@
+"""Random access to the records of an export by service line ID.
+
+When a DEP reviewer asks why a line got its classification, translate_one()
+(``--translate-one ID`` on the command line) seeks straight to the line's
+record and runs the profile's row function on it alone, rather than
+translating the whole export again.
+
+The byte offset of every record is kept in a sidecar file beside the export
+(the export's name + ".ids"). It is built in one pass over the memory-mapped
+export the first time it is needed, cutting records where chunks.record_end()
+does, and built again whenever the export's size or mtime no longer match the
+ones it was built from. It holds a table of (8-byte blake2b digest of the ID,
+offset) entries sorted by digest, which is searched by bisection in the
+mapped file, so a lookup reads a few pages whatever the size of the export.
+The records found are parsed to check their ID, so IDs whose digests collide
+are told apart. With a repeated ID, the first record wins.
+
+Exports must be uncompressed, since they are read at byte offsets.
+"""
+
+import csv
+import hashlib
+import io
+import mmap
+import os
+import struct
+from typing import List, Optional
+
+from leadcast.chunks import record_end
+from leadcast.core import ID, OPTIONAL_INPUT_COLUMNS, as_compiled, translate_record
+from leadcast.reader import parse_records, resolve_columns
+from leadcast.streams import compression
+
+MAGIC = b"LCIDS\x00\x00\x01"
+# Export size, export mtime_ns, position of the ID column, number of entries
+_HEADER = struct.Struct("<QqQQ")
+_ENTRY = struct.Struct("<8sQ")
+_START = len(MAGIC) + _HEADER.size
+
+
+def _digest(line_id: str) -> bytes:
+    return hashlib.blake2b(line_id.encode("utf-8"), digest_size=8).digest()
+
+
+def _row(data: bytes) -> List[str]:
+    # Parsed as the export is, newlines translated
+    return next(csv.reader(io.StringIO(data.decode("utf-8"), newline=None)), [])
+
+
+def _field(data: bytes, column: int) -> str:
+    """Value of a column of one record's bytes"""
+    if b'"' in data:
+        row = _row(data)
+    else:
+        row = data.rstrip(b"\r\n").decode("utf-8").split(",", column + 1)
+    return row[column] if column < len(row) else ""
+
+
+class IdIndex:
+    """The sidecar index of an export's records by ID
+
+    Args:
+        path (str): Uncompressed Leadcast export
+        column (str, optional): Name of the ID column. Defaults to "ID".
+
+    Raises:
+        ValueError: A compressed export, or one without the ID column
+    """
+
+    def __init__(self, path: str, column: str = "ID"):
+        if compression(path) is not None:
+            raise ValueError("Finding records by ID needs an uncompressed export")
+        self.path = path
+        self.sidecar = path + ".ids"
+        self.header = []
+        with open(path, "rb") as infile:
+            if os.fstat(infile.fileno()).st_size:
+                with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    self.header = _row(mapped[: record_end(mapped, 0)])
+        if column not in self.header:
+            raise ValueError(f"{path} has no {column!r} column")
+        # The last one, as with csv.DictReader
+        self.column = len(self.header) - 1 - self.header[::-1].index(column)
+
+    def _key(self) -> tuple:
+        stat = os.stat(self.path)
+        return stat.st_size, stat.st_mtime_ns, self.column
+
+    def _current(self) -> bool:
+        try:
+            with open(self.sidecar, "rb") as infile:
+                start = infile.read(_START)
+        except OSError:
+            return False
+        if len(start) < _START or not start.startswith(MAGIC):
+            return False
+        return _HEADER.unpack_from(start, len(MAGIC))[:3] == self._key()
+
+    def build(self) -> int:
+        """Write the sidecar, whether or not it is current; returns its entries"""
+        key = self._key()
+        entries = []
+        with open(self.path, "rb") as infile:
+            if key[0]:
+                with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    size = len(mapped)
+                    start = record_end(mapped, 0)
+                    while start < size:
+                        end = record_end(mapped, start)
+                        line_id = _field(mapped[start:end], self.column)
+                        if line_id:
+                            entries.append((_digest(line_id), start))
+                        start = end
+        entries.sort()
+
+        building = self.sidecar + ".building"
+        with open(building, "wb") as outfile:
+            outfile.write(MAGIC + _HEADER.pack(*key, len(entries)))
+            pack = _ENTRY.pack
+            outfile.write(b"".join(pack(digest, offset) for digest, offset in entries))
+        os.replace(building, self.sidecar)
+        return len(entries)
+
+    def find(self, line_id: str) -> Optional[List[str]]:
+        """The export row of a service line ID, building the sidecar if need be"""
+        if not self._current():
+            self.build()
+        digest = _digest(line_id)
+        with open(self.sidecar, "rb") as index_file, open(self.path, "rb") as infile:
+            count = _HEADER.unpack_from(index_file.read(_START), len(MAGIC))[3]
+            if not count:
+                return None
+            with mmap.mmap(
+                index_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as index, mmap.mmap(
+                infile.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+
+                def entry(number: int):
+                    return _ENTRY.unpack_from(index, _START + number * _ENTRY.size)
+
+                # Leftmost entry with the digest
+                low, high = 0, count
+                while low < high:
+                    middle = (low + high) // 2
+                    if entry(middle)[0] < digest:
+                        low = middle + 1
+                    else:
+                        high = middle
+                while low < count:
+                    found, offset = entry(low)
+                    if found != digest:
+                        break
+                    row = _row(mapped[offset : record_end(mapped, offset)])
+                    if self.column < len(row) and row[self.column] == line_id:
+                        return row
+                    low += 1
+        return None
+
+
+def find_record(profile, path: str, line_id: str) -> Optional[tuple]:
+    """The record of a service line ID, in the profile's input columns
+
+    Raises:
+        MissingColumnsError: The export lacks a required column
+    """
+    columns = as_compiled(profile).input_columns
+    index = IdIndex(path, columns[ID])
+    indices, width = resolve_columns(index.header, columns, OPTIONAL_INPUT_COLUMNS)
+    row = index.find(line_id)
+    if row is None:
+        return None
+    return next(parse_records([row], indices, width))
+
+
+def translate_one(profile, path: str, line_id: str) -> Optional[List]:
+    """DEP values of one service line of an export, or None if it isn't there
+
+    See core.translate_record() for what a line translated on its own lacks.
+    """
+    record = find_record(profile, path, line_id)
+    if record is None:
+        return None
+    return translate_record(profile, record)
@@ -0,0 +1,117 @@
+"""Incremental translation: translate only the rows that changed.
+
+Weekly exports differ from one another by a few percent of their rows. A
+RowCache keeps, per profile and service line ID, a digest of the record the
+profile reads and the row it translated to (``--incremental cache.db`` on the
+command line). The next run translates only records that are new or whose
+digest changed and takes every other row from the cache (see
+core.translate_values_cached). Street Address 2 is still labelled over the
+whole export in order, so the output is the same as a full run's, byte for
+byte.
+
+The cache is a SQLite database. Its rows for a profile are dropped whenever
+the profile or the translation rules (the sources of leadcast.core,
+leadcast.lookups and leadcast.dates) change. Rows of lines that have left the
+export stay until then; they are never read.
+"""
+
+import hashlib
+import marshal
+import sqlite3
+from typing import Dict, Iterable, List, Tuple
+
+from leadcast import core, dates, lookups
+from leadcast.core import as_compiled
+
+# IDs per SELECT, under SQLite's limit on parameters
+LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rows (
+    profile TEXT NOT NULL,
+    id TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    row BLOB NOT NULL,
+    PRIMARY KEY (profile, id)
+) WITHOUT ROWID;
+"""
+
+
+def fingerprint(profile) -> str:
+    """Digest of a profile and the sources of the rules it is translated by"""
+    digest = hashlib.blake2b(repr(as_compiled(profile).profile).encode("utf-8"))
+    for module in (core, lookups, dates):
+        with open(module.__file__, "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+class RowCache:
+    """Translated rows of earlier runs of one profile, in a SQLite database
+
+    Args:
+        path (str): Database file, created if need be
+        profile: A Profile, its name, or a Compiled profile
+    """
+
+    def __init__(self, path: str, profile):
+        self.profile = as_compiled(profile).profile.name
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+        current = fingerprint(profile)
+        saved = self.connection.execute(
+            "SELECT fingerprint FROM profiles WHERE name = ?", (self.profile,)
+        ).fetchone()
+        if saved is None or saved[0] != current:
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM rows WHERE profile = ?", (self.profile,)
+                )
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO profiles VALUES (?, ?)",
+                    (self.profile, current),
+                )
+
+    def lookup(self, ids: Iterable[str]) -> Dict[str, Tuple[bytes, List, dict]]:
+        """Cached (digest, values, counter increments) of the IDs it has"""
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        for start in range(0, len(ids), LOOKUP_BATCH):
+            batch = ids[start : start + LOOKUP_BATCH]
+            query = (
+                "SELECT id, digest, row FROM rows WHERE profile = ? AND id IN "
+                f"({', '.join('?' * len(batch))})"
+            )
+            for line_id, digest, row in self.connection.execute(
+                query, (self.profile, *batch)
+            ):
+                values, increments = marshal.loads(row)
+                found[line_id] = (digest, values, increments)
+        return found
+
+    def store(self, rows: Iterable[Tuple[str, bytes, List, dict]]):
+        """Keep (id, digest, values, counter increments) rows for the next run"""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?)",
+            (
+                (self.profile, line_id, digest, marshal.dumps((values, increments)))
+                for line_id, digest, values, increments in rows
+            ),
+        )
+
+    def close(self):
+        """Commit this run's rows"""
+        self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
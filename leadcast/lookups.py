@@ -0,0 +1,151 @@
+"""Precompiled lookup tables shared by every translate_* script.
+
+The tables are built once at import time and exposed read-only, so the
+per-row helpers (``material()``, ``install_date_range()``) only pay for a dict
+lookup instead of rebuilding their lists on every call.
+"""
+
+import bisect
+from types import MappingProxyType
+from typing import Optional
+
+# DEP material options on the 2024 inventory form
+FORM_2024_MATERIALS = (
+    "A) Lead",  # 0
+    "B) Lead-lined galvanized",  # 1
+    "C) Galvanized",  # 2
+    "D) Copper",  # 3
+    "E) Cast iron - lined",  # 4
+    "F) Cast iron - unlined",  # 5
+    "G) HDPE - high density polyethylene",  # 6
+    "H) PVC - polyvinyl chloride",  # 7
+    "J) CPVC - chlorine treated PVC",  # 8
+    "K) PEX - cross-linked polyethylene",  # 9
+    "L) ABS - acrylonitrile butadiene styrene",  # 10
+    "M) PB - Polybutylene",  # 11
+    "O) Asbestos cement",  # 12
+    "P) Other non-lead material",  # 13
+    "Q) Unknown - Likely Lead",  # 14
+    "R) Unknown - Unlikely Lead",  # 15
+    "S) Unknown",  # 16
+)
+
+# DEP material options on the 2025 inventory form
+FORM_2025_MATERIALS = (
+    "A) LEAD",  # 0
+    "B) LEAD-LINED GALVANIZED",  # 1
+    "C) GALVANIZED",  # 2
+    "D) COPPER",  # 3
+    "E) CAST IRON - LINED",  # 4
+    "F) CAST IRON - UNLINED",  # 5
+    "G) HDPE - HIGH DENSITY POLYETHYLENE",  # 6
+    "H) PVC - POLYVINYL CHLORIDE",  # 7
+    "I) BRASS",  # 8
+    "J) CPVC - CHLORINE TREATED PVC",  # 9
+    "K) PEX - CROSS-LINKED POLYETHYLENE",  # 10
+    "L) ABS - ACRYLONITRILE BUTADIENE STYRENE",  # 11
+    "M) PB - POLYBUTYLENE",  # 12
+    "N) DUCTILE IRON",  # 13
+    "O) ASBESTOS CEMENT",  # 14
+    "P) OTHER NON-LEAD MATERIAL",  # 15
+    "S) UNKNOWN",  # 16
+    "T) UNKNOWN - NOT LEAD",  # 17
+)
+
+# Leadcast material code -> DEP material, as first mapped in translate.py
+MATERIAL_MAP_2024_V1 = MappingProxyType(
+    {
+        "LD": FORM_2024_MATERIALS[0],
+        "CU": FORM_2024_MATERIALS[3],
+        "BR": FORM_2024_MATERIALS[13],
+        "DI": FORM_2024_MATERIALS[13],
+        "PL": FORM_2024_MATERIALS[7],
+        "CI": FORM_2024_MATERIALS[5],
+        "GALV": FORM_2024_MATERIALS[2],
+        "UNK-NL": FORM_2024_MATERIALS[15],
+        "UNK": FORM_2024_MATERIALS[16],
+    }
+)
+
+# Leadcast material code -> DEP material for the 2024 Lancaster/Reading scripts
+MATERIAL_MAP_2024 = MappingProxyType(
+    {
+        "LD": FORM_2024_MATERIALS[0],
+        "CU": FORM_2024_MATERIALS[3],
+        "BR": FORM_2024_MATERIALS[13],  # add in comments "Brass"
+        "DI": FORM_2024_MATERIALS[13],  # add in comments "Ductile Iron"
+        "PVC": FORM_2024_MATERIALS[7],
+        "CI": FORM_2024_MATERIALS[5],
+        "GALV": FORM_2024_MATERIALS[2],
+        "UNK-NL": FORM_2024_MATERIALS[13],
+        "UNK": FORM_2024_MATERIALS[16],
+        "HDPE": FORM_2024_MATERIALS[6],
+        "PE": FORM_2024_MATERIALS[9],
+        "PL": FORM_2024_MATERIALS[13],  # add in comments "Plastic"
+        "AC": FORM_2024_MATERIALS[12],
+    }
+)
+
+# Leadcast material code -> DEP material for the 2025 form
+MATERIAL_MAP_2025 = MappingProxyType(
+    {
+        "LD": FORM_2025_MATERIALS[0],
+        "CU": FORM_2025_MATERIALS[3],
+        "BR": FORM_2025_MATERIALS[8],  # add in comments "Brass"
+        "DI": FORM_2025_MATERIALS[13],  # add in comments "Ductile Iron"
+        "PVC": FORM_2025_MATERIALS[7],
+        "CI": FORM_2025_MATERIALS[5],
+        "GALV": FORM_2025_MATERIALS[2],
+        "UNK-NL": FORM_2025_MATERIALS[17],
+        "UNK": FORM_2025_MATERIALS[16],
+        "HDPE": FORM_2025_MATERIALS[6],
+        "PE": FORM_2025_MATERIALS[17],
+        "PL": FORM_2025_MATERIALS[17],  # add in comments "Plastic"
+        "AC": FORM_2025_MATERIALS[17],
+    }
+)
+
+# DEP installation date ranges, identical on the 2024 and 2025 forms
+DATE_RANGES = (
+    "A) Pre-1901",
+    "B) 1901 - 1910",
+    "C) 1911 - 1920",
+    "D) 1921 - 1930",
+    "E) 1931 - 1940",
+    "F) 1941 - 1950",
+    "G) 1951 - 1960",
+    "H) 1961 - 1970",
+    "J) 1971 - 1980",
+    "K) 1981 - 1990",
+    "L) 1991 - 2000",
+    "M) 2001 - 2010",
+    "O) 2011 - 2020",
+    "P) 2021 - 2030",
+)
+
+# First year of every bounded range; bisecting an install year into this
+# tuple gives its index in DATE_RANGES
+_DECADE_STARTS = tuple(range(1901, 2031, 10))
+_FIRST_YEAR = _DECADE_STARTS[0]
+_LAST_YEAR = _DECADE_STARTS[-1] + 9
+
+DECADE_BY_YEAR = MappingProxyType(
+    {
+        year: DATE_RANGES[bisect.bisect_right(_DECADE_STARTS, year)]
+        for year in range(_FIRST_YEAR, _LAST_YEAR + 1)
+    }
+)
+
+
+def decade_label(year: int) -> Optional[str]:
+    """Map an installation year to its DEP date range label
+
+    Args:
+        year (int): Installation year
+
+    Returns:
+        Optional[str]: DEP date range, None when the year is past the last range
+    """
+    if year < _FIRST_YEAR:
+        return DATE_RANGES[0]
+    return DECADE_BY_YEAR.get(year)
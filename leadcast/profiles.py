@@ -0,0 +1,461 @@
+"""Declarative translation profiles, one per utility and form revision.
+
+Every ``translate_*.py`` script used to carry its own copy of the row rules.
+The rules themselves live in :mod:`leadcast.core`; what actually differs
+between the scripts is data, and that data is collected here. A profile is
+compiled once by :func:`leadcast.core.compile_profile` into a row function
+with every constant bound, so all profiles share the same hot path.
+
+The profiles reproduce the scripts' output exactly, including their quirks
+(noted next to the field that carries them).
+"""
+
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from leadcast.lookups import MATERIAL_MAP_2024, MATERIAL_MAP_2024_V1, MATERIAL_MAP_2025
+
+# Headers of the 2024 form as translate.py wrote them (list rows)
+COLUMNS_2024_V1 = (
+    "Unique Service Line ID (Required)",
+    "Record Type",
+    "Date Replacement Completed",
+    "Ownership Type",
+    "Street Address 1",
+    "Street Address 2",
+    "City or Township",
+    "Zip Code",
+    "School?",
+    "Childcare Facility?",
+    "Material",
+    "Was Material Ever Previously Lead?",
+    "Lead Pigtail, Gooseneck or Connector Upstream?",
+    "Installation Date Range",
+    "Installation Date Specific",
+    "Diameter (in inches)",
+    "Basis of Material Classification - Non-Field Method",
+    "Basis of Material Classification - Non-Field Method",
+    "Basis of Material Classification - Field Method",
+    "Date of Field Verification",
+    "Additional Comments",
+    "Material",
+    "Lead Pigtail, Gooseneck or Connector Upstream?",
+    "Installation Date Range",
+    "Installation Date Specific",
+    "Basis of Material Classification -Non-Field Method",
+    "Basis of Material Classification - Non-Field Method",
+    "Basis of Material Classification - Field Method",
+    "Date of Field Verification",
+    "Additional Comments",
+    "Service Line Connected To:",
+    "POE Treatment Present?",
+    "Interior Building Plumbing Contains Lead Solder?",
+    "Current LCR Sampling Site?",
+)
+
+# Keys of the 2024 form's dict rows, from translate_lancaster2.py on
+COLUMNS_2024 = (
+    "Unique Service Line ID (Required)",
+    "Record Type",
+    "Date Replacement Completed",
+    "Ownership Type",
+    "Street Address 1",
+    "Street Address 2",
+    "City or Township",
+    "Zip Code",
+    "School?",
+    "Childcare Facility?",
+    "[Utility] Material",
+    "[Utility] Was Material Ever Previously Lead?",
+    "[Utility] Lead Pigtail, Gooseneck or Connector Upstream?",
+    "[Utility] Installation Date Range",
+    "[Utility] Installation Date Specific",
+    "[Utility] Diameter (in inches)",
+    "[Utility]1 Basis of Material Classification - Non-Field Method",
+    "[Utility]2 Basis of Material Classification - Non-Field Method",
+    "[Utility] Basis of Material Classification - Field Method",
+    "[Utility] Date of Field Verification",
+    "[Utility] Additional Comments",
+    "[Private] Material",
+    "[Private] Lead Pigtail, Gooseneck or Connector Upstream?",
+    "[Private] Installation Date Range",
+    "[Private] Installation Date Specific",
+    "[Private]1 Basis of Material Classification - Non-Field Method",
+    "[Private]2 Basis of Material Classification - Non-Field Method",
+    "[Private] Basis of Material Classification - Field Method",
+    "[Private] Date of Field Verification",
+    "[Private] Additional Comments",
+    "Service Line Connected To:",
+    "POE Treatment Present?",
+    "Interior Building Plumbing Contains Lead Solder?",
+    "Current LCR Sampling Site?",
+)
+
+# Keys of the 2025 form's dict rows
+COLUMNS_2025 = (
+    "UNIQUE SERVICE LINE ID",
+    "REPLACEMENT DATE",
+    "SPLIT LINE",
+    "STREET ADDRESS",
+    "STREET ADDRESS 2",
+    "CITY/TOWNSHIP",
+    "ZIP CODE",
+    "SCHOOL",
+    "CHILDCARE",
+    ###
+    "SEGMENT 1 MATERIAL",
+    "EVER PREVIOUSLY LEAD",
+    "LEAD CONNECTOR UPSTREAM",
+    "INSTALLATION DECADE",
+    "INSTALLATION DATE",
+    "DIAMETER (IN INCHES)",
+    "NON-LEAD VERIFICATION 1",
+    "NON-LEAD VERIFICATION 2",
+    "FIELD VERIFICATION DATE",
+    "COMMENTS",
+    ###
+    "SEGMENT 2 MATERIAL",
+    "LEAD CONNECTOR UPSTREAM_2",
+    "INSTALLATION DECADE_2",
+    "INSTALLATION DATE_2",
+    "DIAMETER (IN INCHES)_2",
+    "NON-LEAD VERIFICATION 3",
+    "NON-LEAD VERIFICATION 4",
+    "FIELD VERIFICATION DATE_2",
+    "COMMENTS_2",
+    ###
+    "SERVICE LINE CONNECTED TO",
+    "INORGANIC POE TREATMENT PRESENT",
+    "INTERIOR PLUMBING",
+    "LCRI SAMPLING SITE",
+    ###
+    "NUMBER OF CONNECTORS",
+)
+
+
+class Schema(NamedTuple):
+    """Layout of a DEP form's rows
+
+    Translated rows are lists of values in columns order, so writers go by
+    position and never look at column names.
+    """
+
+    columns: Tuple[str, ...]
+    # Worksheet column (1 is A) of each position on the "Detailed Inventory" sheet
+    sheet_columns: Tuple[int, ...]
+    # Worksheet row of the first data row
+    first_row: int
+
+    def position(self, column: str) -> int:
+        """Index of a column in the rows"""
+        return self.columns.index(column)
+
+
+def field_names(columns: Sequence[str]) -> List[str]:
+    """Column names made unique, the 2025 form's way: a repeat gets _2, _3..."""
+    seen: Dict[str, int] = {}
+    names = []
+    for column in columns:
+        seen[column] = seen.get(column, 0) + 1
+        names.append(column if seen[column] == 1 else f"{column}_{seen[column]}")
+    return names
+
+
+def layout(
+    columns: Tuple[str, ...],
+    first_row: int = 10,
+    first_column: int = 5,
+    wide_columns: Iterable[str] = (),
+) -> Schema:
+    """Schema of columns written left to right from first_column, skipping the
+    column after each wide one"""
+    wide_columns = frozenset(wide_columns)
+    sheet_columns = []
+    column = first_column
+    for name in columns:
+        sheet_columns.append(column)
+        column += 2 if name in wide_columns else 1
+    return Schema(tuple(columns), tuple(sheet_columns), first_row)
+
+
+# The 2024 forms start at E10
+DEP_2024_V1 = layout(COLUMNS_2024_V1)
+DEP_2024 = layout(COLUMNS_2024)
+# The 2025 form starts at F10, and the ID and NON-LEAD VERIFICATION 2/4 columns
+# are each followed by a column the form fills itself
+DEP_2025 = layout(
+    COLUMNS_2025,
+    first_column=6,
+    wide_columns=(
+        "UNIQUE SERVICE LINE ID",
+        "NON-LEAD VERIFICATION 2",
+        "NON-LEAD VERIFICATION 4",
+    ),
+)
+
+MATERIAL_PRIORITY = ("LD", "GALV", "UNK", "UNK-NL", "CU", "PL")
+
+# Street Address 2 schemes
+# A, B, C, ... for every address, including its first occurrence
+LABEL_EVERY_ADDRESS = "every address"
+# A trailing letter on the ID, else A, B, ... for repeats of the raw street
+LABEL_ID_SUFFIX = "id suffix"
+# A, B, ... for repeats of the capitalized street, the first one unlabeled
+LABEL_DUPLICATES = "duplicates"
+
+# Installation date schemes
+# The field as exported; a date that does not parse is an error
+INSTALL_DATE_AS_IS = "as is"
+# The most recent of several " | " separated dates
+INSTALL_DATE_LATEST = "latest"
+
+# Field verification date schemes
+VERIFICATION_DATE_AS_IS = "as is"
+VERIFICATION_DATE_LATEST = "latest"
+
+# Notes schemes
+NOTES_ALL = "all"
+NOTES_WATER_MAIN = "water main"
+
+# What a side's non-field basis is when none of its rules apply
+BASIS_FROM_VERIFICATION_METHOD = "verification method"
+BASIS_NONE = "none"
+# Both basis columns empty and the material forced to "S) Unknown"
+BASIS_UNKNOWN = "unknown"
+
+RECORDS_REVIEW = "A) Records Review"
+OTHER_IN_COMMENTS = "D) Other - enter in Comments field"
+
+
+class BasisRule(NamedTuple):
+    """One step of a side's non-field basis rules
+
+    The first rule whose condition holds fills both "Basis of Material
+    Classification - Non-Field Method" columns and adds its comment.
+
+    Args:
+        when (str): Condition, one of leadcast.core.CONDITIONS
+        comment (str): Comment template. {utility}, {ban_year} and {source} come
+            from the profile, {specific} and {utility_specific} are the side's
+            and the utility side's "Installation Date Specific".
+        second (Optional[str]): Second basis column
+        first (str): First basis column
+    """
+
+    when: str
+    comment: str
+    second: Optional[str] = OTHER_IN_COMMENTS
+    first: str = RECORDS_REVIEW
+
+
+BAN_COMMENT = (
+    "We have high confidence in this record that the service line is non-lead "
+    "due to the {utility} lead ban in {ban_year}."
+)
+DIAMETER_COMMENT = (
+    "We have high confidence in this record from {source} that the service line "
+    "diameter is > 2 inches."
+)
+RECORDS_COMMENT = "We have high confidence in this record from {source}."
+LEAD_COMMENT = "We have high confidence in this record that the material is lead."
+
+# translate_lancaster.py, translate_reading.py and translate_reading2.py
+RECORD_METHOD_RULES = (
+    BasisRule("method is ban", BAN_COMMENT),
+    BasisRule("method is diameter", DIAMETER_COMMENT),
+    BasisRule("method is records", RECORDS_COMMENT, second=None),
+)
+
+
+class Profile(NamedTuple):
+    """How one utility's Leadcast export becomes one DEP form revision"""
+
+    name: str
+    # "2024" or "2025"
+    form: str
+    schema: Schema
+    # translate_iter() yields dicts keyed by columns, else lists
+    as_dict: bool
+    material_map: Mapping[str, str]
+    # Used in comments
+    utility: str = ""
+    lead_ban_year: int = 0
+    records_source: str = "the internal records"
+    # Drop the rows of the "TRAINING" PWS ID
+    skip_training: bool = True
+    # Pick the highest priority of several " | " separated materials
+    material_priority: Optional[Tuple[str, ...]] = MATERIAL_PRIORITY
+    capitalize_street: bool = True
+    street_address_2: str = LABEL_ID_SUFFIX
+    # translate_lancaster2.py and later wrote the childcare answer over School?
+    # and left Childcare Facility? empty
+    childcare_in_school_column: bool = False
+    # Always "Not sure" when False
+    lead_connector: bool = True
+    install_dates: str = INSTALL_DATE_LATEST
+    # Date left out when choosing the most recent one
+    ignored_install_date: Optional[str] = "1/1/1970"
+    verification_dates: str = VERIFICATION_DATE_AS_IS
+    # Both Additional Comments columns stay empty when False
+    comments: bool = True
+    utility_notes: Optional[str] = NOTES_ALL
+    private_notes: Optional[str] = NOTES_ALL
+    utility_basis: Tuple[BasisRule, ...] = RECORD_METHOD_RULES
+    private_basis: Tuple[BasisRule, ...] = RECORD_METHOD_RULES
+    utility_basis_default: str = BASIS_FROM_VERIFICATION_METHOD
+    private_basis_default: str = BASIS_FROM_VERIFICATION_METHOD
+    # 2025 form only
+    change_from_predict_score: bool = True
+    predict_score_threshold: float = 0.1
+    water_main_lead_ban_year: int = 2012
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self.schema.columns
+
+
+# translate.py
+LEADCAST_2024_V1 = Profile(
+    name="leadcast_2024_v1",
+    form="2024",
+    # translate.py wrote over the form's header row
+    schema=DEP_2024_V1._replace(first_row=9),
+    as_dict=False,
+    material_map=MATERIAL_MAP_2024_V1,
+    skip_training=False,
+    material_priority=None,
+    capitalize_street=False,
+    street_address_2=LABEL_EVERY_ADDRESS,
+    lead_connector=False,
+    install_dates=INSTALL_DATE_AS_IS,
+    ignored_install_date=None,
+    comments=False,
+    utility_basis=(),
+    private_basis=(),
+)
+
+# translate_lancaster.py
+LANCASTER_2024_V1 = Profile(
+    name="lancaster_2024_v1",
+    form="2024",
+    schema=DEP_2024_V1,
+    as_dict=False,
+    material_map=MATERIAL_MAP_2024,
+    utility="City of Lancaster PA",
+    lead_ban_year=1991,
+)
+
+# translate_reading.py
+READING_2024_V1 = LANCASTER_2024_V1._replace(
+    name="reading_2024_v1",
+    utility="City of Reading",
+    lead_ban_year=1976,
+    records_source="the service book binder",
+)
+
+# translate_reading2.py
+READING_2024_V2 = Profile(
+    name="reading_2024_v2",
+    form="2024",
+    schema=DEP_2024,
+    as_dict=True,
+    material_map=MATERIAL_MAP_2024,
+    utility="City of Reading",
+    lead_ban_year=1976,
+    childcare_in_school_column=True,
+    verification_dates=VERIFICATION_DATE_LATEST,
+)
+
+# translate_lancaster2.py
+LANCASTER_2024_V2 = READING_2024_V2._replace(
+    name="lancaster_2024_v2",
+    utility="City of Lancaster PA",
+    lead_ban_year=1991,
+    street_address_2=LABEL_DUPLICATES,
+    ignored_install_date=None,
+    utility_notes=NOTES_WATER_MAIN,
+    private_notes=None,
+    utility_basis=(
+        BasisRule("installed after ban", BAN_COMMENT),
+        BasisRule(
+            "method has diameter",
+            "We have high confidence in this tap card from {specific} that the "
+            "service line diameter is > 2 inches.",
+        ),
+        BasisRule(
+            "method is records, material known",
+            "We have high confidence in this tap card from {specific}",
+        ),
+    ),
+    private_basis=(
+        BasisRule("method has ban or installed after ban", BAN_COMMENT),
+        BasisRule(
+            "method has diameter",
+            "We have high confidence in this record from {utility_specific} that "
+            "the service line diameter is > 2 inches.",
+        ),
+        BasisRule(
+            "method is records, material known",
+            "We have high confidence in this record.",
+        ),
+    ),
+    utility_basis_default=BASIS_NONE,
+    private_basis_default=BASIS_NONE,
+)
+
+# translate_lancaster3.py
+LANCASTER_2024_V3 = LANCASTER_2024_V2._replace(
+    name="lancaster_2024_v3",
+    utility_basis=(
+        BasisRule(
+            "installed after ban",
+            "We have high confidence in this tap card from {specific} that the "
+            "service line is non-lead due to the {utility} lead ban in {ban_year}.",
+        ),
+        BasisRule(
+            "dated, method has diameter",
+            "We have high confidence in this tap card from {specific} that the "
+            "service line diameter is > 2 inches.",
+        ),
+        BasisRule("material is lead", LEAD_COMMENT),
+    ),
+    private_basis=(
+        BasisRule(
+            "installed after ban",
+            "We have high confidence in this record from {specific} that the "
+            "service line is non-lead due to the {utility} lead ban in {ban_year}.",
+        ),
+        BasisRule(
+            "dated, method has diameter",
+            "We have high confidence in this record from billing information that "
+            "the service line diameter is > 2 inches.",
+        ),
+        BasisRule("material is lead", LEAD_COMMENT),
+    ),
+    utility_basis_default=BASIS_UNKNOWN,
+    private_basis_default=BASIS_UNKNOWN,
+)
+
+# translate_lancaster4_2025.py
+LANCASTER_2025 = Profile(
+    name="lancaster_2025",
+    form="2025",
+    schema=DEP_2025,
+    as_dict=True,
+    material_map=MATERIAL_MAP_2025,
+    street_address_2=LABEL_DUPLICATES,
+    utility_notes=NOTES_WATER_MAIN,
+    private_notes=None,
+)
+
+PROFILES = {
+    profile.name: profile
+    for profile in (
+        LEADCAST_2024_V1,
+        LANCASTER_2024_V1,
+        READING_2024_V1,
+        READING_2024_V2,
+        LANCASTER_2024_V2,
+        LANCASTER_2024_V3,
+        LANCASTER_2025,
+    )
+}
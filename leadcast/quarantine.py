@@ -0,0 +1,155 @@
+"""Quarantine mode: translate what can be, set aside the rows that can't.
+
+A tolerant run (``--quarantine bad.csv`` on the command line) doesn't stop at
+the first row its row function raises on. That row is written to the
+quarantine file instead, with the error, the columns the validator blames and
+its place in the inventory, and the rest of the export is translated as usual.
+
+The quarantine file is itself an export: fix the values in it and merge() it
+into the CSV output. Only the quarantined rows are translated; they go back in
+their places with the Street Address 2 they were given, so the output ends up
+as a run of the fixed export would have written it. Rows that still fail stay
+in the quarantine file for another go. Leave its rows in, fixed or not: their
+places are counted from one another.
+"""
+
+import csv
+import os
+import tempfile
+from typing import Iterable, Iterator, List, Tuple
+
+from leadcast.core import (
+    ADDRESS_2,
+    OPTIONAL_INPUT_COLUMNS,
+    QUARANTINED,
+    Quarantined,
+    as_compiled,
+    translate_values,
+)
+from leadcast.reader import parse_records, resolve_columns
+from leadcast.streams import open_input, open_output, output_mode
+from leadcast.validate import ERROR, validate_records
+
+# Written before the export columns; "Quarantine Row" is the row's place in
+# the complete inventory, 1 for the first
+META_COLUMNS = (
+    "Quarantine Row",
+    "Quarantine Error",
+    "Quarantine Column",
+    "Quarantine Street Address 2",
+)
+
+
+def failing_columns(profile, record: tuple) -> str:
+    """Columns of record the validator finds errors in, comma separated"""
+    issues = validate_records(profile, [record])
+    columns = [issue.column for issue in issues if issue.severity == ERROR]
+    return ", ".join(dict.fromkeys(columns))
+
+
+class Quarantine:
+    """Diverts the Quarantined rows of a tolerant run to a quarantine CSV
+
+    Args:
+        profile: A Profile, its name, or a Compiled profile
+        path (str): Quarantine file, written even when no row fails
+        report (RunReport, optional): Gets the number of rows quarantined.
+            Defaults to None.
+    """
+
+    def __init__(self, profile, path: str, report=None):
+        self.compiled = as_compiled(profile)
+        self.path = path
+        self.report = report
+        self.count = 0
+
+    def _writer(self, outfile) -> csv.writer:
+        writer = csv.writer(outfile)
+        writer.writerow(META_COLUMNS + tuple(self.compiled.input_columns))
+        return writer
+
+    def _write(self, writer: csv.writer, row: int, values: Quarantined):
+        address_2 = values[ADDRESS_2[self.compiled.profile.form]]
+        columns = failing_columns(self.compiled, values.record)
+        writer.writerow((row, values.error, columns, address_2 or "") + values.record)
+
+    def divert(self, rows: Iterable[List]) -> Iterator[List]:
+        """rows of a tolerant translation, less the Quarantined ones"""
+        with open(self.path, mode="w", newline="", encoding="utf-8") as outfile:
+            writer = self._writer(outfile)
+            for row, values in enumerate(rows, start=1):
+                if values.__class__ is Quarantined:
+                    self._write(writer, row, values)
+                    self.count += 1
+                else:
+                    yield values
+        if self.report is not None:
+            self.report.count({QUARANTINED: self.count})
+        if self.count:
+            print(f"{self.count} row(s) quarantined in {self.path}")
+
+
+def merge(profile, quarantine_file: str, output_file: str) -> Tuple[int, int]:
+    """Translate the rows of a quarantine file into the CSV output they were left out of
+
+    The output is rewritten with the rows that now translate in their places,
+    and the quarantine file with the rows that still don't.
+
+    Raises:
+        MissingColumnsError: The quarantine file lacks a column
+
+    Returns:
+        Tuple[int, int]: Rows merged, and rows still quarantined
+    """
+    if output_mode(output_file) != "csv":
+        raise ValueError("Quarantined rows can only be merged into a CSV output")
+    quarantine = Quarantine(profile, quarantine_file)
+    compiled_profile = quarantine.compiled
+    address_2 = ADDRESS_2[compiled_profile.profile.form]
+    columns = META_COLUMNS + tuple(compiled_profile.input_columns)
+
+    with open(quarantine_file, mode="r", newline="", encoding="utf-8") as infile:
+        reader = csv.reader(infile)
+        indices, width = resolve_columns(
+            next(reader, []), columns, OPTIONAL_INPUT_COLUMNS
+        )
+        entries = list(parse_records(reader, indices, width))
+    meta_width = len(META_COLUMNS)
+    records = [entry[meta_width:] for entry in entries]
+
+    fixed, failing = {}, {}
+    translated = translate_values(compiled_profile, records, tolerant=True)
+    for entry, values in zip(entries, translated):
+        row, label = int(entry[0]), entry[3]
+        values[address_2] = label or None
+        if values.__class__ is Quarantined:
+            failing[row] = values
+        else:
+            fixed[row] = values
+
+    # Written beside the output under the same name, which a .zip's member
+    # is named after
+    scratch = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(output_file)))
+    merging = os.path.join(scratch, os.path.basename(output_file))
+    with open_input(output_file, newline="") as infile, open_output(merging) as outfile:
+        reader = csv.reader(infile)
+        writer = csv.writer(outfile)
+        writer.writerow(next(reader, []))
+        position = 1
+        for existing in reader:
+            while position in fixed or position in failing:
+                if position in fixed:
+                    writer.writerow(fixed[position])
+                position += 1
+            writer.writerow(existing)
+            position += 1
+        for row in sorted(row for row in fixed if row >= position):
+            writer.writerow(fixed[row])
+    os.replace(merging, output_file)
+    os.rmdir(scratch)
+
+    with open(quarantine_file, mode="w", newline="", encoding="utf-8") as outfile:
+        writer = quarantine._writer(outfile)
+        for row in sorted(failing):
+            quarantine._write(writer, row, failing[row])
+    return len(fixed), len(failing)
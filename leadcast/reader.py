@@ -0,0 +1,97 @@
+"""Column-projected reading of Leadcast exports.
+
+csv.DictReader builds a dict of every column for every row, although a
+profile reads a fraction of them. read_records() resolves the columns a
+profile needs to positions once, from the header, and yields tuples of just
+those values, in the order the profile's row function unpacks them.
+"""
+
+import csv
+from operator import itemgetter
+from typing import Collection, Iterable, Iterator, List, Sequence, TextIO, Tuple
+
+
+class MissingColumnsError(ValueError):
+    """The export lacks columns the profile reads"""
+
+    def __init__(self, missing: Sequence[str]):
+        self.missing = list(missing)
+        super().__init__(
+            "Export is missing required column(s): "
+            + ", ".join(repr(column) for column in self.missing)
+        )
+
+
+def check_columns(
+    header: Iterable[str], columns: Sequence[str], optional: Collection[str] = ()
+):
+    """Raise MissingColumnsError unless header has every non-optional column"""
+    present = set(header)
+    missing = [c for c in columns if c not in present and c not in optional]
+    if missing:
+        raise MissingColumnsError(missing)
+
+
+def resolve_columns(
+    header: Sequence[str], columns: Sequence[str], optional: Collection[str] = ()
+) -> Tuple[List[int], int]:
+    """Positions of columns in rows under header, and the header's width
+
+    The last occurrence wins for repeated names, as with csv.DictReader.
+    Absent optional columns point one past the end of the row, where
+    parse_records() appends a "".
+
+    Raises:
+        MissingColumnsError: A required column is missing
+    """
+    check_columns(header, columns, optional)
+    positions = {name: index for index, name in enumerate(header)}
+    width = len(header)
+    return [positions.get(column, width) for column in columns], width
+
+
+def parse_records(
+    rows: Iterable[List[str]], indices: Sequence[int], width: int
+) -> Iterator[tuple]:
+    """Tuples of the values at indices of csv.reader rows
+
+    Blank lines are skipped and short rows are padded with "".
+    """
+    record = itemgetter(*indices)
+    if len(indices) == 1:
+        single = record
+
+        def record(row):
+            return (single(row),)
+
+    padded = width in indices
+    for row in rows:
+        if not row:
+            continue
+        if len(row) < width:
+            row += [""] * (width - len(row))
+        if padded:
+            row.append("")
+        yield record(row)
+
+
+def read_records(
+    infile: TextIO, columns: Sequence[str], optional: Collection[str] = ()
+) -> Iterator[tuple]:
+    """Tuples of the columns' values, one for every row of a CSV export
+
+    The header is read and checked right away, not on the first next().
+    Optional columns missing from the export read as "". Blank lines are
+    skipped and short rows are padded with "".
+
+    Args:
+        infile (TextIO): Export opened in text mode, at its start
+        columns (Sequence[str]): Columns to keep, in the order wanted
+        optional (Collection[str], optional): Columns the export may lack
+
+    Raises:
+        MissingColumnsError: A required column is missing
+    """
+    reader = csv.reader(infile)
+    indices, width = resolve_columns(next(reader, []), columns, optional)
+    return parse_records(reader, indices, width)
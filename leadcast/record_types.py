@@ -0,0 +1,149 @@
+"""Record Type of every line, from the inventory submitted before.
+
+The row functions write every line as "Initial", as the first submission to
+DEP has it. Later submissions say what became of each line since the last one
+(``--previous SUBMITTED.xlsm`` on the command line). The new translation is
+joined to the previous submission on the service line ID:
+
+* a line whose values changed is an Update,
+* a line the previous submission didn't have is an Add,
+* a line it had that is gone from the export is Inactive, and its previous
+  row is written again after the new ones,
+* a line that didn't change is Initial again, the value of a line with
+  nothing to report, whatever it was submitted as (an Add or an Update is
+  reported once, in the submission that added or changed it), but an Inactive
+  line that is back is an Add.
+
+The previous submission, a CSV or workbook (see diff.open_inventory), is
+indexed as ID -> (row digest, Record Type) and the new rows are streamed
+against the index in one pass. It is read a second time only for the rows of
+the Inactive lines. Only the 2024 forms have a Record Type column.
+
+Record Types can't be set in a quarantine run: a line set aside in the
+quarantine file would be written as Inactive, and written again when it is
+merged back.
+"""
+
+import collections
+import sys
+from operator import itemgetter
+from typing import Iterable, Iterator, List
+
+from leadcast.core import as_compiled, record_digest
+from leadcast.diff import open_inventory
+from leadcast.profiles import field_names
+
+RECORD_TYPE = "Record Type"
+INITIAL, UPDATE, ADD, INACTIVE = "Initial", "Update", "Add", "Inactive"
+
+
+def _picker(indices: List[int]):
+    if len(indices) == 1:
+        return lambda row: (row[indices[0]],)
+    return itemgetter(*indices)
+
+
+class RecordTypes:
+    """Sets the Record Type of a translation's rows against the previous submission
+
+    Args:
+        profile: A Profile, its name, or a Compiled profile
+        previous (str): Inventory submitted last, CSV or workbook
+        report (RunReport, optional): Gets the number of lines of each Record
+            Type. Defaults to None.
+
+    Raises:
+        ValueError: The profile's form has no Record Type, or the previous
+            inventory has no columns in common with it
+    """
+
+    def __init__(self, profile, previous: str, report=None):
+        self.profile = as_compiled(profile).profile
+        self.columns = field_names(self.profile.schema.columns)
+        if RECORD_TYPE not in self.columns:
+            raise ValueError(f"The {self.profile.form} form has no {RECORD_TYPE}")
+        self.position = self.columns.index(RECORD_TYPE)
+        self.path = previous
+        self.previous = open_inventory(previous, self.profile)
+        self.report = report
+        self.counts = collections.Counter()
+
+        old_positions = {
+            name: index for index, name in enumerate(self.previous.columns)
+        }
+        compared = [
+            index
+            for index, name in enumerate(self.columns)
+            if index not in (0, self.position) and name in old_positions
+        ]
+        if not compared:
+            raise ValueError(f"{previous} has none of the {self.profile.form} columns")
+        self._new_values = _picker(compared)
+        self._old_values = _picker([old_positions[self.columns[i]] for i in compared])
+        self._old_type = old_positions.get(RECORD_TYPE)
+        # Where each column of the form is in a previous row, to write it again
+        self._old_columns = [old_positions.get(name) for name in self.columns]
+        self._old_width = len(self.previous.columns)
+
+    def _padded(self, row: List[str]) -> List[str]:
+        if len(row) < self._old_width:
+            row = row + [""] * (self._old_width - len(row))
+        return row
+
+    def _index(self) -> dict:
+        index = {}
+        for row in self.previous.rows():
+            row = self._padded(row)
+            record_type = row[self._old_type] if self._old_type is not None else ""
+            index[row[0]] = (
+                record_digest(self._old_values(row)),
+                sys.intern(record_type or INITIAL),
+            )
+        return index
+
+    def _inactive(self, row: List[str]) -> List:
+        values = [
+            (row[position] or None) if position is not None else None
+            for position in self._old_columns
+        ]
+        values[self.position] = INACTIVE
+        return values
+
+    def assign(self, rows: Iterable[List]) -> Iterator[List]:
+        """rows with their Record Types, then the rows of the Inactive lines"""
+        index = self._index()
+        counts = self.counts
+        for values in rows:
+            previous = index.pop(values[0], None)
+            if previous is None:
+                record_type = ADD
+            else:
+                texts = [
+                    "" if value is None else str(value)
+                    for value in self._new_values(values)
+                ]
+                if previous[0] != record_digest(texts):
+                    record_type = UPDATE
+                elif previous[1] == INACTIVE:
+                    record_type = ADD
+                else:
+                    record_type = INITIAL
+            values[self.position] = record_type
+            counts[record_type] += 1
+            yield values
+
+        # What is left of the index is gone from the export
+        if index:
+            for row in self.previous.rows():
+                if index.pop(row[0], None) is not None:
+                    counts[INACTIVE] += 1
+                    yield self._inactive(self._padded(row))
+
+        if self.report is not None:
+            self.report.count(
+                {f"record_type_{name.lower()}": count for name, count in counts.items()}
+            )
+        print(
+            f"Record Types against {self.path}: "
+            + ", ".join(f"{counts[name]} {name}" for name in (UPDATE, ADD, INACTIVE))
+        )
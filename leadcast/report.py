@@ -0,0 +1,119 @@
+"""Run reports: where a translation spends its time and what it counted.
+
+Reports are opt-in. A RunReport passed to convert.translate_to_csv() or
+translate_to_xlsm() (``--report`` on the command line) collects the wall time
+of every stage and the row counters, and write() saves them as JSON. Runs
+without one use the untimed row functions and pay nothing.
+
+The stages are reading the export, the four parts of each row (see
+core.STAGES; Street Address 2 counts as basic info) and writing the output.
+With worker processes the row stages, and the read of an uncompressed export,
+are timed in the workers and summed, so they can add up to more than the wall
+time.
+"""
+
+import datetime
+import json
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Sequence
+
+from leadcast.core import QUARANTINED, SKIPPED, STAGES as ROW_STAGES, UNMAPPED
+
+STAGES = ("read",) + ROW_STAGES + ("write",)
+
+
+class RunReport:
+    """Wall time per stage and row counters of one translation run
+
+    Args:
+        **details: What was run (profile, input, output...), copied into the
+            report as they are
+    """
+
+    def __init__(self, **details):
+        self.details = details
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.rows_seen = 0
+        self.counters = {SKIPPED: 0, UNMAPPED: 0, QUARANTINED: 0}
+        self.overrides = {}
+        self.started = datetime.datetime.now()
+        self.wall = None
+        self._start = time.perf_counter()
+
+    def read(self, records: Iterable[tuple]) -> Iterator[tuple]:
+        """records, timed as the read stage and counted as rows seen"""
+        clock = time.perf_counter
+        records = iter(records)
+        seconds, count = 0.0, 0
+        try:
+            while True:
+                start = clock()
+                record = next(records, None)
+                seconds += clock() - start
+                if record is None:
+                    return
+                count += 1
+                yield record
+        finally:
+            self.seconds["read"] += seconds
+            self.rows_seen += count
+
+    @contextmanager
+    def writing(self, rows: Iterable):
+        """Time a writer consuming rows
+
+        The block's wall time, less the time spent producing the rows it takes,
+        is the write stage.
+        """
+        produced = [0.0]
+
+        def timed_rows():
+            clock = time.perf_counter
+            rows_iter = iter(rows)
+            while True:
+                start = clock()
+                try:
+                    row = next(rows_iter)
+                except StopIteration:
+                    return
+                finally:
+                    produced[0] += clock() - start
+                yield row
+
+        start = time.perf_counter()
+        yield timed_rows()
+        self.seconds["write"] += time.perf_counter() - start - produced[0]
+
+    def count(self, counters: dict, overrides: Sequence[str] = ()):
+        """Add a run's counters; overrides names the predict score counters"""
+        for name, value in counters.items():
+            if name in overrides:
+                self.overrides[name] = self.overrides.get(name, 0) + value
+            else:
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def as_dict(self) -> dict:
+        wall = self.wall if self.wall is not None else time.perf_counter() - self._start
+        rows = self.rows_seen - self.counters[SKIPPED] - self.counters[QUARANTINED]
+        return {
+            **self.details,
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_seconds": round(wall, 6),
+            "rows_per_second": round(rows / wall, 1) if wall else None,
+            "stages": {stage: round(self.seconds[stage], 6) for stage in STAGES},
+            "counters": {
+                "rows_seen": self.rows_seen,
+                "rows_translated": rows,
+                **self.counters,
+                "predict_score_overrides": dict(self.overrides),
+            },
+        }
+
+    def write(self, path: str):
+        """Stop the clock and save the report as JSON"""
+        if self.wall is None:
+            self.wall = time.perf_counter() - self._start
+        with open(path, mode="w", encoding="utf-8") as outfile:
+            json.dump(self.as_dict(), outfile, indent=2)
+            outfile.write("\n")
@@ -0,0 +1,147 @@
+"""A SQLite database of translated inventories, one table per run.
+
+A run with a store (``--store inventories.db`` on the command line) loads the
+rows it writes into a new table of the database as well, so questions about
+an inventory are answered by a query instead of another translation::
+
+    SELECT count(*) FROM run_3
+    WHERE "ZIP CODE" = '17603'
+      AND "SEGMENT 1 MATERIAL" = 'A) LEAD'
+      AND "INSTALLATION DECADE" = 'F) 1941 - 1950';
+
+Values are stored as the form has them, material and decade labels included.
+
+The runs table lists the tables with the profile, input, output and time of
+their runs. A table's columns are the form's, named as field_names() makes
+them unique, all TEXT, with NULL for an empty value. The unique service line
+ID, the zip code, the segment materials and the installation decades (date
+ranges on the 2024 forms) are indexed.
+
+Rows are inserted with executemany() a batch at a time as they are written,
+all in one transaction, and the indexes are built once the table is full. A
+run that fails leaves no table behind. The database is in WAL mode, so it can
+be queried while a run loads. The load doesn't wait for the disk
+(synchronous=OFF) until the table is committed and checkpointed into the
+database. benchmarks/bench_store.py measures a load.
+"""
+
+import datetime
+import re
+import sqlite3
+from typing import Iterable, Iterator, List
+
+from leadcast.core import as_compiled
+from leadcast.parallel import shards
+from leadcast.profiles import field_names
+
+# Rows per executemany(), held back from the writer until they are inserted
+LOAD_BATCH = 50000
+# Columns indexed besides the ID, by name
+INDEXED = re.compile(
+    r"(zip code|material|installation (decade|date range))(_\d+)?$", re.IGNORECASE
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    profile TEXT NOT NULL,
+    input TEXT,
+    output TEXT,
+    loaded TEXT NOT NULL,
+    rows INTEGER
+);
+"""
+
+
+def _quoted(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def indexed_columns(columns: Iterable[str]) -> List[str]:
+    """Columns of a run's table that get an index: the ID, then by INDEXED"""
+    columns = list(columns)
+    return columns[:1] + [name for name in columns[1:] if INDEXED.search(name)]
+
+
+class Store:
+    """Loads the rows of one run into a new table of a SQLite database
+
+    Args:
+        path (str): Database file, created if need be
+        profile: A Profile, its name, or a Compiled profile
+        input_file (str, optional): The run's export, for the runs table
+        output_file (str, optional): The run's output, for the runs table
+    """
+
+    def __init__(self, path: str, profile, input_file=None, output_file=None):
+        self.path = path
+        self.profile = as_compiled(profile).profile
+        self.input_file = input_file
+        self.output_file = output_file
+        self.columns = field_names(self.profile.schema.columns)
+        self.table = None
+
+    def _create(self, connection: sqlite3.Connection) -> str:
+        cursor = connection.execute(
+            "INSERT INTO runs (name, profile, input, output, loaded) "
+            "VALUES ('', ?, ?, ?, ?)",
+            (
+                self.profile.name,
+                self.input_file,
+                self.output_file,
+                datetime.datetime.now().isoformat(timespec="seconds"),
+            ),
+        )
+        table = f"run_{cursor.lastrowid}"
+        connection.execute(
+            "UPDATE runs SET name = ? WHERE id = ?", (table, cursor.lastrowid)
+        )
+        columns = ", ".join(f"{_quoted(name)} TEXT" for name in self.columns)
+        connection.execute(f"CREATE TABLE {table} ({columns})")
+        return table
+
+    def _index(self, connection: sqlite3.Connection, table: str):
+        for number, name in enumerate(indexed_columns(self.columns)):
+            connection.execute(
+                f"CREATE INDEX {table}_{number} ON {table} ({_quoted(name)})"
+            )
+
+    def load(self, rows: Iterable[List]) -> Iterator[List]:
+        """rows, loaded into the new table as they go by
+
+        The table is committed once rows are exhausted, and its name is then
+        in table.
+        """
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.executescript(_SCHEMA)
+            connection.execute("BEGIN")
+            table = self._create(connection)
+            width = len(self.columns)
+            insert = f"INSERT INTO {table} VALUES ({', '.join('?' * width)})"
+            count = 0
+            for batch in shards(rows, LOAD_BATCH):
+                # Values written to the form as "" are stored as NULL too
+                connection.executemany(
+                    insert,
+                    ([value or None for value in values[:width]] for values in batch),
+                )
+                count += len(batch)
+                yield from batch
+            self._index(connection, table)
+            connection.execute(
+                "UPDATE runs SET rows = ? WHERE name = ?", (count, table)
+            )
+            connection.execute("COMMIT")
+            # The checkpoint on close, which copies the table into the
+            # database, waits for the disk
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.table = table
+        finally:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            connection.close()
+        print(f"{count} rows loaded into {table} of {self.path}")
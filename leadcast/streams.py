@@ -0,0 +1,218 @@
+"""Compressed exports and outputs, chosen by file extension.
+
+Exports archived as ``.gz``, ``.bz2``, ``.zst`` or ``.zip`` are read as they
+are, without decompressing them to disk first. Decompression runs in a
+background thread a few chunks ahead of the reader, so it overlaps with the
+translation (zlib, bz2 and zstd release the GIL while they work). CSV outputs
+with the same extensions are compressed as they are written.
+
+``.zst`` needs the zstandard package (``pip install zstandard``) before Python
+3.14; everything else is in the standard library. A ``.zip`` export must hold
+one CSV.
+
+The extension of an output also picks its format (output_mode()): a workbook,
+Parquet, Arrow IPC, or else a CSV, compressed or not.
+"""
+
+import bz2
+import gzip
+import io
+import os
+import queue
+import threading
+import zipfile
+from typing import BinaryIO, Optional, TextIO
+
+COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".zst": "zstd", ".zip": "zip"}
+# Decompressed bytes per chunk handed over by the background thread, and how
+# many chunks it may run ahead
+CHUNK_SIZE = 1 << 20
+QUEUE_DEPTH = 4
+# gzip's own default, 9, is several times slower for a few percent
+GZIP_LEVEL = 6
+
+
+MODES = ("csv", "xlsm", "parquet", "arrow")
+# Output extensions that pick a mode; anything else is a CSV, maybe compressed
+EXTENSIONS = {
+    ".xlsm": "xlsm",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+def output_mode(output: str) -> str:
+    """The mode an output file's extension implies"""
+    return EXTENSIONS.get(os.path.splitext(output)[1].lower(), "csv")
+
+
+def compression(path: str) -> Optional[str]:
+    """gzip, bz2, zstd or zip as the path's extension says, else None"""
+    return COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def _zstd():
+    try:
+        from compression import zstd  # Python 3.14+
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            ".zst files need the zstandard package (pip install zstandard)"
+        ) from None
+    return zstandard
+
+
+def _zip_member(archive: zipfile.ZipFile) -> str:
+    names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    if len(names) > 1:
+        names = [name for name in names if name.lower().endswith(".csv")]
+    if len(names) != 1:
+        raise ValueError(
+            f"{archive.filename} must hold exactly one CSV, found {len(names)}"
+        )
+    return names[0]
+
+
+def _open_read(path: str, kind: str) -> BinaryIO:
+    if kind == "gzip":
+        return gzip.open(path, "rb")
+    if kind == "bz2":
+        return bz2.open(path, "rb")
+    if kind == "zstd":
+        return _zstd().open(path, "rb")
+    # The member keeps the archive's file open after the archive is closed
+    with zipfile.ZipFile(path) as archive:
+        return archive.open(_zip_member(archive))
+
+
+class _ZipMemberWriter(io.RawIOBase):
+    """Writes a zip archive's single member, closing the archive with it"""
+
+    def __init__(self, path: str):
+        self._archive = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        name = os.path.splitext(os.path.basename(path))[0]
+        if not name.lower().endswith(".csv"):
+            name += ".csv"
+        self._member = self._archive.open(name, "w", force_zip64=True)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        return self._member.write(data)
+
+    def close(self):
+        if not self.closed:
+            self._member.close()
+            self._archive.close()
+        super().close()
+
+
+def _open_write(path: str, kind: str) -> BinaryIO:
+    if kind == "gzip":
+        return gzip.open(path, "wb", compresslevel=GZIP_LEVEL)
+    if kind == "bz2":
+        return bz2.open(path, "wb")
+    if kind == "zstd":
+        return _zstd().open(path, "wb")
+    return _ZipMemberWriter(path)
+
+
+class _Prefetcher(io.RawIOBase):
+    """Reads a binary stream in a background thread, a few chunks ahead"""
+
+    def __init__(self, source: BinaryIO, chunk_size=CHUNK_SIZE, depth=QUEUE_DEPTH):
+        self._source = source
+        self._chunks = queue.Queue(depth)
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._pump, args=(chunk_size,), name="leadcast-prefetch", daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _pump(self, chunk_size: int):
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read(chunk_size)
+                self._put(chunk)
+                if not chunk:
+                    break
+        except BaseException as error:  # Raised again in the reading thread
+            self._put(error)
+        finally:
+            self._source.close()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._pending:
+            if self._eof:
+                return 0
+            chunk = self._chunks.get()
+            if isinstance(chunk, BaseException):
+                self._eof = True
+                raise chunk
+            if not chunk:
+                self._eof = True
+                return 0
+            self._pending = memoryview(chunk)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            # Unblock a pending put so the thread sees the stop
+            while self._thread.is_alive():
+                try:
+                    self._chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+        super().close()
+
+
+def open_input(path: str, newline: Optional[str] = None) -> TextIO:
+    """An export opened for reading as text, decompressed on the fly if need be
+
+    newline is open()'s: "" reads a CSV this package wrote back as it is.
+    """
+    kind = compression(path)
+    if kind is None:
+        return open(path, mode="r", encoding="utf-8", newline=newline)
+    raw = _Prefetcher(_open_read(path, kind))
+    return io.TextIOWrapper(
+        io.BufferedReader(raw, CHUNK_SIZE), encoding="utf-8", newline=newline
+    )
+
+
+def open_output(path: str) -> TextIO:
+    """A CSV output opened for writing as text, compressed if its extension says"""
+    kind = compression(path)
+    if kind is None:
+        return open(path, mode="w", newline="", encoding="utf-8")
+    return io.TextIOWrapper(
+        io.BufferedWriter(_open_write(path, kind), CHUNK_SIZE),
+        encoding="utf-8",
+        newline="",
+    )
@@ -0,0 +1,195 @@
+"""On-disk cache of split workbook templates.
+
+Splitting the DEP form (unzipping it, cutting the worksheet XML around the data
+area and parsing the pre-formatted rows) is the same work on every run, so the
+result is kept on disk, keyed by a hash of the template's bytes:
+
+    <cache directory>/<sha256>/
+        manifest.json   zip member names, dates and attributes, sheet prefix
+        head.xml        worksheet XML up to <sheetData>
+        header.xml      template rows above the first data row
+        rows.json       parsed template rows from the first data row on
+        tail.xml        worksheet XML from </sheetData> on
+        members/<n>     every other zip member (shared strings, styles,
+                        vbaProject.bin, ...)
+
+A new form revision has a different hash, so it gets a new entry and the old
+one ages out. Entries are evicted least recently used first once the cache
+grows past max_bytes. A cache directory that can't be written to is no reason
+to stop a run: the template is split without being kept. Templates are also kept in memory for as long as the
+TemplateCache lives, so a batch writing several workbooks reads each entry once.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from leadcast.xlsm import FIRST_ROW, SHEET_NAME, Template, read_template
+
+# Bump when the entry layout or the way templates are split changes
+CACHE_VERSION = 1
+CACHE_DIR_ENV = "LEADCAST_CACHE_DIR"
+DEFAULT_MAX_BYTES = 256 << 20
+
+
+def default_directory() -> str:
+    """$LEADCAST_CACHE_DIR, else leadcast/templates under the user cache dir"""
+    if os.environ.get(CACHE_DIR_ENV):
+        return os.environ[CACHE_DIR_ENV]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "leadcast", "templates")
+
+
+def template_key(input_xlsm: str, sheet_name: str, first_row: int) -> str:
+    """Hash of the template's bytes and of how it is split"""
+    digest = hashlib.sha256(f"{CACHE_VERSION}\0{sheet_name}\0{first_row}\0".encode())
+    with open(input_xlsm, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_text(path: str, text: str):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def _read_text(path: str) -> str:
+    with open(path, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def _write_entry(entry: str, template: Template):
+    os.mkdir(os.path.join(entry, "members"))
+    members = []
+    for index, (name, date_time, external_attr, data) in enumerate(template.members):
+        if data is not None:
+            with open(os.path.join(entry, "members", str(index)), "wb") as f:
+                f.write(data)
+        members.append([name, list(date_time), external_attr, data is not None])
+    _write_text(os.path.join(entry, "head.xml"), template.head)
+    _write_text(os.path.join(entry, "header.xml"), template.header)
+    _write_text(os.path.join(entry, "tail.xml"), template.tail)
+    _write_text(os.path.join(entry, "rows.json"), json.dumps(template.rows))
+    # Written last: an entry without a manifest is incomplete
+    manifest = {
+        "members": members,
+        "prefix": template.prefix,
+        "first_row": template.first_row,
+    }
+    _write_text(os.path.join(entry, "manifest.json"), json.dumps(manifest))
+
+
+def _read_entry(entry: str) -> Template:
+    manifest = json.loads(_read_text(os.path.join(entry, "manifest.json")))
+    members = []
+    for index, (name, date_time, external_attr, stored) in enumerate(
+        manifest["members"]
+    ):
+        data = None
+        if stored:
+            with open(os.path.join(entry, "members", str(index)), "rb") as f:
+                data = f.read()
+        members.append((name, tuple(date_time), external_attr, data))
+    rows = [
+        (number, attributes, {int(column): xml for column, xml in cells.items()}, raw)
+        for number, attributes, cells, raw in json.loads(
+            _read_text(os.path.join(entry, "rows.json"))
+        )
+    ]
+    return Template(
+        members,
+        manifest["prefix"],
+        _read_text(os.path.join(entry, "head.xml")),
+        _read_text(os.path.join(entry, "header.xml")),
+        rows,
+        _read_text(os.path.join(entry, "tail.xml")),
+        manifest["first_row"],
+    )
+
+
+def _entry_size(entry: str) -> int:
+    size = 0
+    for root, _, files in os.walk(entry):
+        for name in files:
+            size += os.path.getsize(os.path.join(root, name))
+    return size
+
+
+class TemplateCache:
+    """Split templates kept on disk between runs
+
+    Args:
+        directory (Optional[str], optional): Cache directory. Defaults to
+            default_directory().
+        max_bytes (int, optional): Size the cache is trimmed to after each new
+            entry. Defaults to DEFAULT_MAX_BYTES.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        self._loaded = {}
+
+    def load(
+        self, input_xlsm: str, sheet_name: str = SHEET_NAME, first_row: int = FIRST_ROW
+    ) -> Template:
+        """The split template, from the cache if this exact template was seen before"""
+        key = template_key(input_xlsm, sheet_name, first_row)
+        if key in self._loaded:
+            return self._loaded[key]
+        entry = os.path.join(self.directory, key)
+        try:
+            template = _read_entry(entry)
+        except (OSError, ValueError, KeyError):
+            # Missing or incomplete entry
+            template = read_template(input_xlsm, sheet_name, first_row)
+            try:
+                self._store(entry, template)
+                self.evict(keep=key)
+            except OSError:
+                # A cache directory that can't be written (read-only or
+                # missing home), so the template is split on every run
+                pass
+        else:
+            # The directory's mtime is its last use, for eviction
+            try:
+                os.utime(entry)
+            except OSError:
+                pass
+        self._loaded[key] = template
+        return template
+
+    def _store(self, entry: str, template: Template):
+        os.makedirs(self.directory, exist_ok=True)
+        # Build the entry beside its final place and rename it in, so other
+        # runs never see half an entry
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.directory)
+        try:
+            _write_entry(staging, template)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.rename(staging, entry)
+        except OSError:
+            # Another run stored the same template first
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def evict(self, keep: Optional[str] = None):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            entries.append((os.path.getmtime(path), name, _entry_size(path)))
+
+        total = sum(size for _, _, size in entries)
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+            total -= size
@@ -0,0 +1,317 @@
+"""Pre-flight validation of Leadcast exports.
+
+A malformed value deep in an export stops a translation partway through: a
+verification date that isn't "%m/%d/%Y" fails in latest_date(), a water main
+year that isn't a number fails int(). validate_file() reads the export once,
+checks the columns the profile reads, and lists every problem with the row and
+service line ID, so a bad export is turned away before a long workbook write.
+
+Problems are of two severities:
+
+* ERROR, a value that stops the translation (dates the profile parses, predict
+  scores, the water main year), or a date it needs that is missing,
+* WARNING, a value that translates but loses information (material codes
+  missing from the profile's material map, unknown Building Types, install
+  dates the profile drops because they don't parse).
+
+Exports repeat the same values thousands of times, so each check runs once per
+distinct value of its column and remembers the answer.
+"""
+
+import csv
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from leadcast.core import (
+    BUILDING_TYPES,
+    DATE_CONDITIONS,
+    ID,
+    OPTIONAL_INPUT_COLUMNS,
+    PWS_ID,
+    UNKNOWN_STATUS,
+    as_compiled,
+)
+from leadcast.dates import parse_date
+from leadcast.profiles import INSTALL_DATE_AS_IS, VERIFICATION_DATE_LATEST, Profile
+from leadcast.reader import read_records
+from leadcast.streams import open_input
+
+ERROR, WARNING = "error", "warning"
+INDEX_COLUMNS = ("row", "id", "column", "value", "problem", "severity")
+
+
+class Issue(NamedTuple):
+    """A bad value: its data row (1 is the first after the header) and ID"""
+
+    row: int
+    id: str
+    column: str
+    value: str
+    problem: str
+    severity: str
+
+
+class Check(NamedTuple):
+    """test(value) -> problem or None, run on the non-empty values of column
+
+    when limits the check to the rows the translation reads the column in: a
+    (column, value) pair for rows where that column has that value, or
+    when(get) -> bool, get(column) being the row's value of a column. A
+    required column's empty values are tested too.
+    """
+
+    column: str
+    test: Callable[[str], Optional[str]]
+    severity: str
+    when: Optional[Union[tuple, Callable]] = None
+    required: bool = False
+
+
+def _date(value: str) -> Optional[str]:
+    try:
+        parse_date(value)
+    except ValueError:
+        return "not a m/d/yyyy date"
+    return None
+
+
+def _single_date(value: str) -> Optional[str]:
+    return None if "|" in value else _date(value)
+
+
+def _dates(ignored: Optional[str] = None, only_lists: bool = False) -> Callable:
+    """Test of " | " separated dates, as latest_date() reads them"""
+
+    def test(value: str) -> Optional[str]:
+        if not value:
+            return "no date"
+        if only_lists and "|" not in value:
+            return None
+        dates = [d for d in value.split(" | ") if d != ignored]
+        if not dates:
+            return f"no date besides {ignored}"
+        if any(_date(date) for date in dates):
+            return "a date that is not m/d/yyyy"
+        return None
+
+    return test
+
+
+def _number(value: str) -> Optional[str]:
+    try:
+        float(value)
+    except ValueError:
+        return "not a number"
+    return None
+
+
+def _year(value: str) -> Optional[str]:
+    try:
+        int(value)
+    except ValueError:
+        return "not a whole year"
+    return None
+
+
+def _material(profile: Profile) -> Callable:
+    known = profile.material_map
+
+    def test(value: str) -> Optional[str]:
+        if any(code not in known for code in value.split(" | ")):
+            return "unknown material code"
+        return None
+
+    return test
+
+
+def _building(value: str) -> Optional[str]:
+    return None if value in BUILDING_TYPES else "unknown Building Type"
+
+
+def _status_known(profile: Profile) -> Callable:
+    """when of the water main year, read for a side whose status is known"""
+    threshold = profile.predict_score_threshold
+
+    def low_score(score: str) -> bool:
+        try:
+            return float(score) <= threshold
+        except ValueError:
+            return False
+
+    def when(get: Callable[[str], str]) -> bool:
+        for side in ("Utility", "Private"):
+            if get(f"{side} Status") != UNKNOWN_STATUS:
+                return True
+            # Made Non-Lead by a low predict score
+            if profile.change_from_predict_score and low_score(
+                get(f"Predict Score {side}")
+            ):
+                return True
+        return False
+
+    return when
+
+
+def _install_checks(profile: Profile, column: str, needs_date: bool) -> List[Check]:
+    if profile.install_dates == INSTALL_DATE_AS_IS:
+        return [Check(column, _date, ERROR)]
+    checks = [Check(column, _dates(profile.ignored_install_date, True), ERROR)]
+    # A single date that doesn't parse only loses its range, unless a basis
+    # rule parses it
+    checks.append(Check(column, _single_date, ERROR if needs_date else WARNING))
+    return checks
+
+
+def profile_checks(profile: Profile) -> List[Check]:
+    """What validate_records() checks for the profile, mirroring its row function"""
+    material = _material(profile)
+    checks = [
+        Check("Building Type", _building, WARNING),
+        Check("Utility Materials", material, WARNING),
+        Check("Private Materials", material, WARNING),
+    ]
+    if profile.form == "2025":
+        checks += [
+            Check("Water Main Install Year", _year, ERROR, _status_known(profile)),
+            Check("Predict Score Utility", _number, ERROR),
+            Check("Predict Score Private", _number, ERROR),
+            Check("Utility Installation Dates", _date, ERROR),
+            Check("Private Installation Dates", _date, ERROR),
+            Check(
+                "Utility Verification date",
+                _dates(),
+                ERROR,
+                ("Utility Field Verified", "Yes"),
+            ),
+            Check(
+                "Private Verification Date",
+                _dates(),
+                ERROR,
+                ("Private Field Verified", "Yes"),
+            ),
+        ]
+        return checks
+
+    for side, rules in (
+        ("Utility", profile.utility_basis),
+        ("Private", profile.private_basis),
+    ):
+        needs_date = any(rule.when in DATE_CONDITIONS for rule in rules)
+        checks += _install_checks(profile, f"{side} Installation Dates", needs_date)
+    if profile.verification_dates == VERIFICATION_DATE_LATEST:
+        # latest_date() fails on an empty date as well
+        checks += [
+            Check(
+                "Utility Verification date",
+                _dates(),
+                ERROR,
+                ("Utility Field Verified", "Yes"),
+                required=True,
+            ),
+            Check(
+                "Private Verification Date",
+                _dates(),
+                ERROR,
+                ("Private Field Verified", "Yes"),
+                required=True,
+            ),
+        ]
+    return checks
+
+
+def _applies(when, position: Dict[str, int]) -> Optional[Callable]:
+    """A Check's when, as a test of records"""
+    if when is None:
+        return None
+    if callable(when):
+        return lambda record: when(lambda column: record[position[column]])
+    index, expected = position[when[0]], when[1]
+    return lambda record: record[index] == expected
+
+
+def validate_records(profile, records: Iterable[tuple]) -> Iterator[Issue]:
+    """Problems of records, as read_records() yields them, in row order"""
+    compiled_profile = as_compiled(profile)
+    profile = compiled_profile.profile
+    position = {c: i for i, c in enumerate(compiled_profile.input_columns)}
+    prepared = []
+    for check in profile_checks(profile):
+        # One answer per distinct value
+        answers: Dict[str, Optional[str]] = {}
+        prepared.append(
+            (position[check.column], check, _applies(check.when, position), answers)
+        )
+    skip_training = profile.skip_training
+
+    for row, record in enumerate(records, start=1):
+        if skip_training and record[PWS_ID] == "TRAINING":
+            continue
+        for index, check, applies, answers in prepared:
+            value = record[index]
+            if not (value or check.required) or (
+                applies is not None and not applies(record)
+            ):
+                continue
+            try:
+                problem = answers[value]
+            except KeyError:
+                problem = answers[value] = check.test(value)
+            if problem is not None:
+                yield Issue(
+                    row, record[ID], check.column, value, problem, check.severity
+                )
+
+
+def validate_file(profile, input_file: str) -> List[Issue]:
+    """Problems of an export, compressed or not
+
+    Raises:
+        MissingColumnsError: The export lacks a required column
+    """
+    compiled_profile = as_compiled(profile)
+    with open_input(input_file) as infile:
+        records = read_records(
+            infile, compiled_profile.input_columns, OPTIONAL_INPUT_COLUMNS
+        )
+        return list(validate_records(compiled_profile, records))
+
+
+def errors(issues: Iterable[Issue]) -> List[Issue]:
+    """The issues that would stop a translation"""
+    return [issue for issue in issues if issue.severity == ERROR]
+
+
+def write_index(issues: Iterable[Issue], path: str) -> int:
+    """Save issues as a CSV error index, returns how many"""
+    count = 0
+    with open(path, mode="w", newline="", encoding="utf-8") as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(INDEX_COLUMNS)
+        for issue in issues:
+            writer.writerow(issue)
+            count += 1
+    return count
+
+
+def summary(issues: List[Issue]) -> str:
+    """One line per column and problem kind, with its count and first rows"""
+    groups: Dict[tuple, List[Issue]] = {}
+    for issue in issues:
+        key = (issue.severity, issue.column, issue.problem)
+        groups.setdefault(key, []).append(issue)
+    lines = []
+    for (severity, column, problem), group in sorted(groups.items()):
+        ids = ", ".join(issue.id for issue in group[:3])
+        more = f" and {len(group) - 3} more" if len(group) > 3 else ""
+        lines.append(
+            f"{severity:<7} {column}: {problem} ({len(group)} rows: {ids}{more})"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,356 @@
+"""Streaming writer for the DEP inventory workbook.
+
+Instead of loading the whole ``.xlsm`` template with openpyxl and setting one
+cell at a time, the translated rows are streamed straight into the
+``Detailed Inventory`` worksheet XML inside the zip:
+
+* every other part of the workbook (``vbaProject.bin``, ``styles.xml``, the
+  shared strings, the other sheets) is copied across byte for byte,
+* the worksheet XML before ``<sheetData>`` and everything after
+  ``</sheetData>`` (data validations, conditional formatting, page setup) is
+  kept verbatim, as are the template rows above the first data row,
+* template rows that the data lands on keep their formatting and any cells the
+  data doesn't touch (formulas in the leading columns, for instance); the
+  written cells keep the template cell's style,
+* the data cells are written as inline strings, so the shared strings table
+  never has to be rebuilt. The cell markup is formatted directly rather than
+  through ``et_xmlfile``, whose per-element serializer costs about a
+  millisecond a row.
+
+Only the template's worksheet XML is held in memory; the rows are written as
+they are produced.
+"""
+
+import io
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape, unescape
+
+SHEET_NAME = "Detailed Inventory"
+CELL_CACHE_SIZE = 1 << 16
+
+# Data starts at row 10 of every DEP form; where each value goes across the row
+# is the profile's Schema
+FIRST_ROW = 10
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_SHEET_DATA = re.compile(r"<((?:\w+:)?)sheetData\b[^>]*?(/?)>")
+_DIMENSION = re.compile(r"<(?:\w+:)?dimension\b[^>]*/>")
+_ROW = re.compile(r"<(?:\w+:)?row\b([^>]*?)(?:/>|>(.*?)</(?:\w+:)?row>)", re.S)
+_CELL = re.compile(r"<(?:\w+:)?c\b([^>]*?)(?:/>|>.*?</(?:\w+:)?c>)", re.S)
+_ATTRIBUTE = re.compile(r'([\w:.-]+)="([^"]*)"')
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+_CALC_CHAIN_TYPE = re.compile(r'<Override\b[^>]*PartName="/xl/calcChain.xml"[^>]*/>')
+_CALC_CHAIN_REL = re.compile(r'<Relationship\b[^>]*Target="[^"]*calcChain.xml"[^>]*/>')
+# Characters that are not allowed in XML 1.0 (openpyxl refuses them too)
+_ILLEGAL_CHARACTERS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_ESCAPE = {'"': "&quot;"}
+_UNESCAPE = {"&quot;": '"', "&apos;": "'"}
+
+# A template row: (row number, row attributes, {column: raw cell XML}, raw row XML)
+TemplateRow = Tuple[int, Dict[str, str], Dict[int, str], str]
+
+
+def column_letter(column: int) -> str:
+    """1 -> A, 26 -> Z, 27 -> AA"""
+    letters = ""
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_index(letters: str) -> int:
+    """A -> 1, Z -> 26, AA -> 27"""
+    column = 0
+    for letter in letters:
+        column = column * 26 + ord(letter) - 64
+    return column
+
+
+def sheet_part(archive: zipfile.ZipFile, sheet_name: str) -> str:
+    """Path inside the zip of the worksheet XML for sheet_name
+
+    Raises:
+        KeyError: the workbook has no sheet of that name
+    """
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    for sheet in workbook.iter(f"{{{MAIN_NS}}}sheet"):
+        if sheet.get("name") == sheet_name:
+            rel_id = sheet.get(f"{{{REL_NS}}}id")
+            break
+    else:
+        raise KeyError(f"Worksheet {sheet_name!r} does not exist.")
+    for rel in rels.iter(f"{{{PACKAGE_REL_NS}}}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+    raise KeyError(f"Worksheet {sheet_name!r} has no part in the workbook.")
+
+
+def _attributes(text: str) -> Dict[str, str]:
+    return {
+        name: unescape(value, _UNESCAPE) for name, value in _ATTRIBUTE.findall(text)
+    }
+
+
+def _template_rows(sheet_data: str) -> Iterator[TemplateRow]:
+    for row in _ROW.finditer(sheet_data):
+        attributes = _attributes(row.group(1))
+        cells = {}
+        for cell in _CELL.finditer(row.group(2) or ""):
+            ref = _attributes(cell.group(1))["r"]
+            cells[column_index(_CELL_REF.match(ref).group(1))] = cell.group(0)
+        yield int(attributes["r"]), attributes, cells, row.group(0)
+
+
+def split_sheet(xml: str, first_row: int = FIRST_ROW):
+    """Cut the template worksheet XML around the data area
+
+    Returns:
+        tuple: (XML up to and including <sheetData>, raw XML of the rows above
+        first_row, parsed template rows from first_row on, XML from
+        </sheetData> to the end, namespace prefix of the sheet elements)
+    """
+    match = _SHEET_DATA.search(xml)
+    prefix, empty = match.groups()
+    # The written rows change the used range, and the dimension is optional
+    head = _DIMENSION.sub("", xml[: match.start()]) + f"<{prefix}sheetData>"
+    if empty:
+        body, tail = "", f"</{prefix}sheetData>" + xml[match.end() :]
+    else:
+        end = xml.index(f"</{prefix}sheetData>", match.end())
+        body, tail = xml[match.end() : end], xml[end:]
+
+    header, rows = [], []
+    for row in _ROW.finditer(body):
+        if int(_attributes(row.group(1))["r"]) < first_row:
+            header.append(row.group(0))
+        else:
+            rows.extend(_template_rows(body[row.start() :]))
+            break
+    return head, "".join(header), rows, tail, prefix
+
+
+def _escape(text: str) -> str:
+    text = _ILLEGAL_CHARACTERS.sub("", text)
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _cell(prefix: str, ref: str, value, style: str) -> str:
+    """XML for one written cell; style is the ' s="n"' attribute or ''"""
+    return f'<{prefix}c r="{ref}"{style}{_cell_content(prefix, value)}'
+
+
+# The same few thousand values (materials, statuses, cities, dates) fill most
+# cells, so their markup is built once
+@lru_cache(maxsize=CELL_CACHE_SIZE, typed=True)
+def _cell_content(prefix: str, value) -> str:
+    if value is None or value == "":
+        return "/>"
+    if isinstance(value, bool):
+        return f' t="b"><{prefix}v>{value:d}</{prefix}v></{prefix}c>'
+    if isinstance(value, (int, float)):
+        return f"><{prefix}v>{value!r}</{prefix}v></{prefix}c>"
+    text = _escape(str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return (
+        f' t="inlineStr"><{prefix}is><{prefix}t{space}>{text}</{prefix}t>'
+        f"</{prefix}is></{prefix}c>"
+    )
+
+
+def _row_start(prefix: str, number: int, attributes: Dict[str, str]) -> str:
+    # spans is only a loading hint and no longer matches once cells are added
+    attrs = "".join(
+        f' {name}="{escape(value, _ESCAPE)}"'
+        for name, value in attributes.items()
+        if name not in ("r", "spans")
+    )
+    return f'<{prefix}row r="{number}"{attrs}>'
+
+
+def _write_row(text, prefix, number, columns, letters, values, attributes, template):
+    """Write one data row, merged with the template row at the same number"""
+    parts = [_row_start(prefix, number, attributes)]
+    if template:
+        cells = dict(zip(columns, values))
+        for column in sorted(template.keys() | cells.keys()):
+            if column not in cells:
+                parts.append(template[column])
+                continue
+            style = ""
+            if column in template:
+                s = _attributes(_CELL.match(template[column]).group(1)).get("s")
+                style = f' s="{s}"' if s is not None else ""
+            elif cells[column] is None or cells[column] == "":
+                continue
+            ref = f"{column_letter(column)}{number}"
+            parts.append(_cell(prefix, ref, cells[column], style))
+    else:
+        content = _cell_content
+        parts += [
+            f'<{prefix}c r="{column}{number}"{content(prefix, value)}'
+            for column, value in zip(letters, values)
+            if value is not None and value != ""
+        ]
+    parts.append(f"</{prefix}row>")
+    text.write("".join(parts))
+
+
+def _write_sheet(handle, template: "Template", rows, columns: Sequence[int]) -> int:
+    prefix = template.prefix
+    text = io.TextIOWrapper(handle, encoding="utf-8", newline="\n")
+    text.write(template.head)
+    text.write(template.header)
+    letters = [column_letter(column) for column in columns]
+    number = template.first_row
+    pending = iter(template.rows)
+    next_template = next(pending, None)
+    for values in rows:
+        attributes, cells = {}, {}
+        if next_template and next_template[0] == number:
+            _, attributes, cells, _ = next_template
+            next_template = next(pending, None)
+        _write_row(text, prefix, number, columns, letters, values, attributes, cells)
+        number += 1
+    # Template rows below the data are kept as they are
+    while next_template:
+        text.write(next_template[3])
+        next_template = next(pending, None)
+    text.write(template.tail)
+    text.flush()
+    text.detach()
+    return number - template.first_row
+
+
+def _drop_calc_chain(name: str, data: Optional[bytes]) -> Optional[bytes]:
+    # Excel rebuilds the calculation chain on load; a stale one that still
+    # lists overwritten formula cells makes it offer to repair the file
+    if name == "[Content_Types].xml":
+        return _CALC_CHAIN_TYPE.sub("", data.decode("utf-8")).encode("utf-8")
+    if name == "xl/_rels/workbook.xml.rels":
+        return _CALC_CHAIN_REL.sub("", data.decode("utf-8")).encode("utf-8")
+    return data
+
+
+class Template(NamedTuple):
+    """A workbook template, split around the data area of one worksheet"""
+
+    # (name, date_time, external_attr, data) of every zip member, in order;
+    # data is None for the worksheet the rows go in
+    members: List[Tuple[str, tuple, int, Optional[bytes]]]
+    prefix: str
+    head: str
+    header: str
+    rows: List[TemplateRow]
+    tail: str
+    first_row: int
+
+
+def read_template(
+    input_xlsm: str, sheet_name: str = SHEET_NAME, first_row: int = FIRST_ROW
+) -> Template:
+    """Read and split a workbook template
+
+    Raises:
+        KeyError: the workbook has no sheet called sheet_name
+    """
+    members = []
+    with zipfile.ZipFile(input_xlsm) as source:
+        sheet = sheet_part(source, sheet_name)
+        for info in source.infolist():
+            if info.filename == "xl/calcChain.xml":
+                continue
+            data = source.read(info)
+            if info.filename == sheet:
+                head, header, rows, tail, prefix = split_sheet(
+                    data.decode("utf-8"), first_row
+                )
+                data = None
+            members.append(
+                (
+                    info.filename,
+                    info.date_time,
+                    info.external_attr,
+                    _drop_calc_chain(info.filename, data),
+                )
+            )
+    return Template(members, prefix, head, header, rows, tail, first_row)
+
+
+def write_template(
+    rows: Iterable[Sequence],
+    template: Template,
+    output_xlsm: str,
+    columns: Sequence[int],
+) -> int:
+    """Write a copy of a split template with rows streamed into its worksheet
+
+    Each row's values go in the worksheet columns of the same positions.
+
+    Returns:
+        int: Number of rows written
+    """
+    count = 0
+    with zipfile.ZipFile(output_xlsm, "w", zipfile.ZIP_DEFLATED) as target:
+        for name, date_time, external_attr, data in template.members:
+            info = zipfile.ZipInfo(name, date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = external_attr
+            if data is not None:
+                target.writestr(info, data)
+                continue
+            # The filled sheet can pass the 2 GiB zip limit
+            with target.open(info, "w", force_zip64=True) as handle:
+                count = _write_sheet(handle, template, rows, columns)
+    return count
+
+
+def write_rows(
+    rows: Iterable[Sequence],
+    input_xlsm: str,
+    output_xlsm: str,
+    columns: Sequence[int],
+    sheet_name: str = SHEET_NAME,
+    first_row: int = FIRST_ROW,
+    cache=None,
+) -> int:
+    """Stream translated rows into a copy of the DEP workbook template
+
+    Args:
+        rows (Iterable[Sequence]): Translated value lists
+        input_xlsm (str): Template workbook, read but never modified
+        output_xlsm (str): Workbook to write
+        columns (Sequence[int]): Worksheet column of each value, as in
+            Schema.sheet_columns
+        sheet_name (str, optional): Worksheet the rows go in. Defaults to SHEET_NAME.
+        first_row (int, optional): Row of the first data row. Defaults to FIRST_ROW.
+        cache (TemplateCache, optional): Where split templates are kept between
+            runs. Defaults to None, reading the template every time.
+
+    Returns:
+        int: Number of rows written
+    """
+    if cache is None:
+        template = read_template(input_xlsm, sheet_name, first_row)
+    else:
+        template = cache.load(input_xlsm, sheet_name, first_row)
+    return write_template(rows, template, output_xlsm, columns)
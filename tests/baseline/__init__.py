@@ -0,0 +1,30 @@
+"""The translate_*.py scripts as they were before the single core, unchanged.
+
+They are the reference the profiles are checked against (test_baseline.py),
+and are loaded by load_script(), which leaves out their example usage: run on
+import, it would translate files that aren't there.
+"""
+
+import os
+import types
+
+SCRIPTS = {
+    "leadcast_2024_v1": "translate.py",
+    "lancaster_2024_v1": "translate_lancaster.py",
+    "lancaster_2024_v2": "translate_lancaster2.py",
+    "lancaster_2024_v3": "translate_lancaster3.py",
+    "lancaster_2025": "translate_lancaster4_2025.py",
+    "reading_2024_v1": "translate_reading.py",
+    "reading_2024_v2": "translate_reading2.py",
+}
+
+
+def load_script(profile: str) -> types.ModuleType:
+    """The baseline script of a profile, as a module, without its example usage"""
+    path = os.path.join(os.path.dirname(__file__), SCRIPTS[profile])
+    with open(path, encoding="utf-8") as f:
+        source = f.read().split("\n# Example usage")[0]
+    module = types.ModuleType(f"baseline_{profile}")
+    module.__file__ = path
+    exec(compile(source, path, "exec"), module.__dict__)
+    return module